@@ -3,7 +3,7 @@ from sqlalchemy import engine_from_config, pool
 from alembic import context
 from app.db.database import Base
 from app.db.models import Event, Case
-from app.config import get_settings
+from app.config import settings
 
 # this is the Alembic Config object
 config = context.config
@@ -13,7 +13,6 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # Get database URL from settings
-settings = get_settings()
 config.set_main_option("sqlalchemy.url", settings.database_url)
 
 # Add your model's MetaData object here for 'autogenerate' support
@@ -0,0 +1,52 @@
+"""add composite sort indexes
+
+Revision ID: 003
+Revises: 1d6a9625e530
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '1d6a9625e530'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Documents: WHERE case_id = ? ORDER BY created_at DESC is served pre-sorted.
+    # The composite index also covers plain case_id lookups.
+    op.create_index(
+        'idx_documents_case_created',
+        'documents',
+        ['case_id', sa.text('created_at DESC')]
+    )
+    op.drop_index('idx_documents_case_id', table_name='documents')
+
+    # Cost tracking: per-service recent records
+    op.create_index(
+        'idx_ai_cost_tracking_service_created',
+        'ai_cost_tracking',
+        ['service_type', sa.text('created_at DESC')]
+    )
+    op.drop_index('idx_ai_cost_tracking_service_type', table_name='ai_cost_tracking')
+
+    # Events: aggregate replay in sequence order
+    op.create_index(
+        'idx_events_aggregate_sequence',
+        'events',
+        ['aggregate_type', 'aggregate_id', 'sequence_number']
+    )
+    op.drop_index('idx_events_aggregate', table_name='events')
+
+
+def downgrade() -> None:
+    op.create_index('idx_events_aggregate', 'events', ['aggregate_type', 'aggregate_id'])
+    op.drop_index('idx_events_aggregate_sequence', table_name='events')
+    op.create_index('idx_ai_cost_tracking_service_type', 'ai_cost_tracking', ['service_type'])
+    op.drop_index('idx_ai_cost_tracking_service_created', table_name='ai_cost_tracking')
+    op.create_index('idx_documents_case_id', 'documents', ['case_id'])
+    op.drop_index('idx_documents_case_created', table_name='documents')
@@ -0,0 +1,45 @@
+"""add ai cost daily materialized view
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Daily rollup of ai_cost_tracking used by the admin cost summary
+    op.execute("""
+        CREATE MATERIALIZED VIEW mv_ai_cost_daily AS
+        SELECT
+            created_at::date AS date,
+            service_type,
+            model_name,
+            SUM(cost_usd) AS total_cost,
+            COUNT(*) AS request_count,
+            SUM(input_tokens) AS total_input_tokens,
+            SUM(output_tokens) AS total_output_tokens
+        FROM ai_cost_tracking
+        GROUP BY 1, 2, 3
+    """)
+
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index(
+        'idx_mv_ai_cost_daily_key',
+        'mv_ai_cost_daily',
+        ['date', 'service_type', 'model_name'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_mv_ai_cost_daily_key', table_name='mv_ai_cost_daily')
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_ai_cost_daily')
@@ -0,0 +1,37 @@
+"""brin index on ai_cost_tracking.created_at
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ai_cost_tracking is append-only, so created_at correlates with physical
+    # order and a BRIN summary is enough to skip pages for time-range scans
+    op.drop_index('idx_ai_cost_tracking_created_at', table_name='ai_cost_tracking')
+    op.create_index(
+        'idx_ai_cost_tracking_created_at_brin',
+        'ai_cost_tracking',
+        ['created_at'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32}
+    )
+
+    # Vacuum more often so BRIN ranges get summarized promptly
+    op.execute('ALTER TABLE ai_cost_tracking SET (autovacuum_vacuum_scale_factor = 0.02)')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE ai_cost_tracking RESET (autovacuum_vacuum_scale_factor)')
+    op.drop_index('idx_ai_cost_tracking_created_at_brin', table_name='ai_cost_tracking')
+    op.create_index('idx_ai_cost_tracking_created_at', 'ai_cost_tracking', ['created_at'])
@@ -0,0 +1,38 @@
+"""add keyset pagination indexes
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_cases: ORDER BY created_at DESC, case_id DESC with (created_at, case_id) < cursor
+    op.create_index(
+        'idx_cases_created_id',
+        'cases',
+        [sa.text('created_at DESC'), sa.text('case_id DESC')]
+    )
+
+    # get_recent_costs: the BRIN index serves range aggregates but cannot
+    # return rows in order, so the recent-records feed gets its own B-Tree
+    op.create_index(
+        'idx_ai_cost_tracking_created_id',
+        'ai_cost_tracking',
+        [sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ai_cost_tracking_created_id', table_name='ai_cost_tracking')
+    op.drop_index('idx_cases_created_id', table_name='cases')
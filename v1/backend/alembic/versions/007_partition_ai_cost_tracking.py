@@ -0,0 +1,153 @@
+"""partition ai_cost_tracking by month
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import backfill_paginated
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+MV_AI_COST_DAILY = """
+    CREATE MATERIALIZED VIEW mv_ai_cost_daily AS
+    SELECT
+        created_at::date AS date,
+        service_type,
+        model_name,
+        SUM(cost_usd) AS total_cost,
+        COUNT(*) AS request_count,
+        SUM(input_tokens) AS total_input_tokens,
+        SUM(output_tokens) AS total_output_tokens
+    FROM ai_cost_tracking
+    GROUP BY 1, 2, 3
+"""
+
+
+def _create_indexes() -> None:
+    op.create_index('idx_ai_cost_tracking_document_id', 'ai_cost_tracking', ['document_id'])
+    op.create_index('idx_ai_cost_tracking_case_id', 'ai_cost_tracking', ['case_id'])
+    op.create_index(
+        'idx_ai_cost_tracking_service_created',
+        'ai_cost_tracking',
+        ['service_type', sa.text('created_at DESC')]
+    )
+    op.create_index(
+        'idx_ai_cost_tracking_created_at_brin',
+        'ai_cost_tracking',
+        ['created_at'],
+        postgresql_using='brin',
+        postgresql_with={'pages_per_range': 32}
+    )
+    op.create_index(
+        'idx_ai_cost_tracking_created_id',
+        'ai_cost_tracking',
+        [sa.text('created_at DESC'), sa.text('id DESC')]
+    )
+
+
+def _create_cost_view() -> None:
+    op.execute(MV_AI_COST_DAILY)
+    op.create_index(
+        'idx_mv_ai_cost_daily_key',
+        'mv_ai_cost_daily',
+        ['date', 'service_type', 'model_name'],
+        unique=True
+    )
+
+
+def upgrade() -> None:
+    # Creates {parent}_yYYYYmMM covering one calendar month; idempotent so the
+    # app can call it ahead of time for upcoming months
+    op.execute("""
+        CREATE OR REPLACE FUNCTION create_monthly_partition(parent text, month_start date)
+        RETURNS void AS $$
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                parent || to_char(month_start, '"_y"YYYY"m"MM'),
+                parent,
+                month_start,
+                (month_start + interval '1 month')::date
+            );
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    # The rollup view depends on the table being replaced
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_ai_cost_daily')
+    op.rename_table('ai_cost_tracking', 'ai_cost_tracking_old')
+
+    op.execute("""
+        CREATE TABLE ai_cost_tracking (
+            LIKE ai_cost_tracking_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        ) PARTITION BY RANGE (created_at)
+    """)
+
+    # One partition per month from the oldest row through two months ahead,
+    # plus a default partition so inserts never fail for a missing month
+    op.execute("""
+        SELECT create_monthly_partition('ai_cost_tracking', month::date)
+        FROM generate_series(
+            date_trunc('month', COALESCE((SELECT MIN(created_at) FROM ai_cost_tracking_old), now())),
+            date_trunc('month', now()) + interval '2 months',
+            interval '1 month'
+        ) AS month
+    """)
+    op.execute('CREATE TABLE ai_cost_tracking_default PARTITION OF ai_cost_tracking DEFAULT')
+
+    # Copy in committed batches rather than one giant INSERT ... SELECT
+    backfill_paginated(op, 'ai_cost_tracking_old', 'ai_cost_tracking')
+    op.drop_table('ai_cost_tracking_old')
+
+    # Partition key must be part of the primary key
+    op.create_primary_key('ai_cost_tracking_pkey', 'ai_cost_tracking', ['id', 'created_at'])
+    op.create_foreign_key(
+        'ai_cost_tracking_document_id_fkey', 'ai_cost_tracking', 'documents',
+        ['document_id'], ['document_id'], ondelete='SET NULL'
+    )
+    op.create_foreign_key(
+        'ai_cost_tracking_case_id_fkey', 'ai_cost_tracking', 'cases',
+        ['case_id'], ['case_id'], ondelete='SET NULL'
+    )
+    _create_indexes()
+    op.execute('ALTER TABLE ai_cost_tracking SET (autovacuum_vacuum_scale_factor = 0.02)')
+
+    _create_cost_view()
+
+
+def downgrade() -> None:
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS mv_ai_cost_daily')
+    op.rename_table('ai_cost_tracking', 'ai_cost_tracking_partitioned')
+
+    op.execute("""
+        CREATE TABLE ai_cost_tracking (
+            LIKE ai_cost_tracking_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        )
+    """)
+    backfill_paginated(op, 'ai_cost_tracking_partitioned', 'ai_cost_tracking')
+    op.drop_table('ai_cost_tracking_partitioned')  # Drops all partitions
+
+    op.create_primary_key('ai_cost_tracking_pkey', 'ai_cost_tracking', ['id'])
+    op.create_foreign_key(
+        'ai_cost_tracking_document_id_fkey', 'ai_cost_tracking', 'documents',
+        ['document_id'], ['document_id'], ondelete='SET NULL'
+    )
+    op.create_foreign_key(
+        'ai_cost_tracking_case_id_fkey', 'ai_cost_tracking', 'cases',
+        ['case_id'], ['case_id'], ondelete='SET NULL'
+    )
+    _create_indexes()
+    op.execute('ALTER TABLE ai_cost_tracking SET (autovacuum_vacuum_scale_factor = 0.02)')
+
+    _create_cost_view()
+    op.execute('DROP FUNCTION IF EXISTS create_monthly_partition(text, date)')
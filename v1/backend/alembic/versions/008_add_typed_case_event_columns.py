@@ -0,0 +1,54 @@
+"""add typed case columns to events
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Fixed-schema CaseCreated fields move out of the JSONB payload
+    op.add_column('events', sa.Column('event_data_title', sa.String(500), nullable=True))
+    op.add_column('events', sa.Column('event_data_case_number', sa.String(100), nullable=True))
+
+    op.execute("""
+        UPDATE events
+        SET event_data_title = event_data->>'title',
+            event_data_case_number = event_data->>'case_number',
+            event_data = event_data - 'title' - 'case_number'
+        WHERE event_type = 'CaseCreated'
+    """)
+
+    # B-Tree on the scalar instead of a GIN index over the whole payload
+    op.create_index(
+        'idx_events_case_number',
+        'events',
+        ['event_data_case_number'],
+        postgresql_where=sa.text('event_data_case_number IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_events_case_number', table_name='events')
+
+    op.execute("""
+        UPDATE events
+        SET event_data = event_data || jsonb_build_object(
+            'title', event_data_title,
+            'case_number', event_data_case_number
+        )
+        WHERE event_type = 'CaseCreated'
+    """)
+
+    op.drop_column('events', 'event_data_case_number')
+    op.drop_column('events', 'event_data_title')
@@ -0,0 +1,44 @@
+"""add jsonb_path_ops GIN indexes on metadata columns
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # jsonb_path_ops only serves @> containment but is about half the size of
+    # the default jsonb_ops. Filter with column @> '{"k": v}', not column->>'k'.
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_events_metadata_gin',
+            'events',
+            ['event_metadata'],
+            postgresql_using='gin',
+            postgresql_ops={'event_metadata': 'jsonb_path_ops'},
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'idx_documents_metadata_gin',
+            'documents',
+            ['document_metadata'],
+            postgresql_using='gin',
+            postgresql_ops={'document_metadata': 'jsonb_path_ops'},
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_documents_metadata_gin', table_name='documents', postgresql_concurrently=True)
+        op.drop_index('idx_events_metadata_gin', table_name='events', postgresql_concurrently=True)
@@ -0,0 +1,37 @@
+"""extend documents case/created index with document_id for keyset paging
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # list_documents orders by (created_at, document_id) DESC and pages with a
+    # row comparison on both; with document_id in the index the whole
+    # ORDER BY ... LIMIT is a single range scan, ties included
+    op.create_index(
+        'idx_documents_case_created_id',
+        'documents',
+        ['case_id', sa.text('created_at DESC'), sa.text('document_id DESC')]
+    )
+    op.drop_index('idx_documents_case_created', table_name='documents')
+
+
+def downgrade() -> None:
+    op.create_index(
+        'idx_documents_case_created',
+        'documents',
+        ['case_id', sa.text('created_at DESC')]
+    )
+    op.drop_index('idx_documents_case_created_id', table_name='documents')
@@ -0,0 +1,49 @@
+"""add documents.content_hash for analysis reuse
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # SHA-256 of the uploaded bytes, previously kept in document_metadata
+    op.add_column('documents', sa.Column('content_hash', sa.String(64), nullable=True))
+
+    op.execute("""
+        UPDATE documents
+        SET content_hash = document_metadata->>'sha256',
+            document_metadata = document_metadata - 'sha256'
+        WHERE document_metadata ? 'sha256'
+    """)
+
+    # analyze_document looks up finished analyses of identical content
+    op.create_index(
+        'idx_documents_content_hash',
+        'documents',
+        ['content_hash'],
+        postgresql_where=sa.text('content_hash IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_documents_content_hash', table_name='documents')
+
+    op.execute("""
+        UPDATE documents
+        SET document_metadata = COALESCE(document_metadata, '{}'::jsonb)
+            || jsonb_build_object('sha256', content_hash)
+        WHERE content_hash IS NOT NULL
+    """)
+
+    op.drop_column('documents', 'content_hash')
@@ -0,0 +1,83 @@
+"""move annotations from documents.document_metadata into their own table
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'document_annotations',
+        sa.Column('annotation_id', postgresql.UUID(as_uuid=True), primary_key=True,
+                  server_default=sa.text('gen_random_uuid()')),
+        sa.Column('document_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('page', sa.Integer, nullable=False),
+        sa.Column('rects', postgresql.JSONB, nullable=False),
+        sa.Column('color', sa.String(50), nullable=False),
+        sa.Column('text', sa.Text, nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['document_id'], ['documents.document_id'], ondelete='CASCADE')
+    )
+
+    # get_annotations: WHERE document_id = ? ORDER BY created_at
+    op.create_index(
+        'idx_document_annotations_document_created',
+        'document_annotations',
+        ['document_id', 'created_at']
+    )
+
+    op.execute("""
+        INSERT INTO document_annotations (annotation_id, document_id, page, rects, color, text, created_at)
+        SELECT (ann->>'id')::uuid,
+               d.document_id,
+               (ann->>'page')::int,
+               ann->'rects',
+               ann->>'color',
+               ann->>'text',
+               (ann->>'created_at')::timestamp AT TIME ZONE 'UTC'
+        FROM documents d
+        CROSS JOIN LATERAL jsonb_array_elements(d.document_metadata->'annotations') AS ann
+        WHERE jsonb_typeof(d.document_metadata->'annotations') = 'array'
+    """)
+
+    op.execute("""
+        UPDATE documents
+        SET document_metadata = document_metadata - 'annotations'
+        WHERE document_metadata ? 'annotations'
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE documents d
+        SET document_metadata = COALESCE(d.document_metadata, '{}'::jsonb)
+            || jsonb_build_object('annotations', a.annotations)
+        FROM (
+            SELECT document_id,
+                   jsonb_agg(jsonb_build_object(
+                       'id', annotation_id::text,
+                       'page', page,
+                       'rects', rects,
+                       'color', color,
+                       'text', text,
+                       'created_at', to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US')
+                   ) ORDER BY created_at) AS annotations
+            FROM document_annotations
+            GROUP BY document_id
+        ) a
+        WHERE d.document_id = a.document_id
+    """)
+
+    op.drop_index('idx_document_annotations_document_created', table_name='document_annotations')
+    op.drop_table('document_annotations')
@@ -0,0 +1,34 @@
+"""covering index for per-document lookups within a case
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # WHERE document_id = ? AND case_id = ? selecting only these columns (preview
+    # URLs, existence checks) becomes an index-only scan. CONCURRENTLY cannot run
+    # inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_documents_id_case_covering',
+            'documents',
+            ['document_id', 'case_id'],
+            postgresql_include=['s3_key', 'file_type', 'original_filename'],
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('idx_documents_id_case_covering', table_name='documents', postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""store write-only payload columns as json instead of jsonb
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '014'
+down_revision = '013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Never filtered or indexed server-side, only written and read back whole,
+    # so the jsonb conversion on every write buys nothing. event_metadata,
+    # document_metadata and extra_data stay jsonb (GIN indexes, @>, ? and ||).
+    # Rewrites both tables under an ACCESS EXCLUSIVE lock.
+    op.alter_column(
+        'events', 'event_data',
+        type_=sa.JSON, existing_type=postgresql.JSONB,
+        existing_nullable=False, postgresql_using='event_data::json'
+    )
+    op.alter_column(
+        'cases', 'case_metadata',
+        type_=sa.JSON, existing_type=postgresql.JSONB,
+        postgresql_using='case_metadata::json'
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'cases', 'case_metadata',
+        type_=postgresql.JSONB, existing_type=sa.JSON,
+        postgresql_using='case_metadata::jsonb'
+    )
+    op.alter_column(
+        'events', 'event_data',
+        type_=postgresql.JSONB, existing_type=sa.JSON,
+        existing_nullable=False, postgresql_using='event_data::jsonb'
+    )
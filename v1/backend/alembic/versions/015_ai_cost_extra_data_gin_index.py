@@ -0,0 +1,32 @@
+"""add jsonb_path_ops GIN index on ai_cost_tracking.extra_data
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '015'
+down_revision = '014'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Serves extra_data @> '{"k": v}' (see get_recent_costs). Postgres cannot
+    # build an index on a partitioned table CONCURRENTLY; this one is created
+    # on the parent and cascades to every monthly partition.
+    op.create_index(
+        'idx_ai_cost_tracking_extra_data_gin',
+        'ai_cost_tracking',
+        ['extra_data'],
+        postgresql_using='gin',
+        postgresql_ops={'extra_data': 'jsonb_path_ops'}
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ai_cost_tracking_extra_data_gin', table_name='ai_cost_tracking')
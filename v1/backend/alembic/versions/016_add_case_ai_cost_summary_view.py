@@ -0,0 +1,45 @@
+"""add per-case ai cost summary materialized view
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '016'
+down_revision = '015'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Spend per case and service for the admin case cost view; rows without
+    # a case (e.g. orphaned after a case delete) are left out
+    op.execute("""
+        CREATE MATERIALIZED VIEW case_ai_cost_summary AS
+        SELECT
+            case_id,
+            service_type,
+            SUM(cost_usd) AS total_cost,
+            COUNT(*) AS calls,
+            MAX(created_at) AS last_call
+        FROM ai_cost_tracking
+        WHERE case_id IS NOT NULL
+        GROUP BY case_id, service_type
+    """)
+
+    # Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.create_index(
+        'idx_case_ai_cost_summary_key',
+        'case_ai_cost_summary',
+        ['case_id', 'service_type'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_case_ai_cost_summary_key', table_name='case_ai_cost_summary')
+    op.execute('DROP MATERIALIZED VIEW IF EXISTS case_ai_cost_summary')
@@ -0,0 +1,35 @@
+"""covering (case_id, created_at) index on ai_cost_tracking
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '017'
+down_revision = '016'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Spend over time for one case (and the per-case rollup) reads only these
+    # columns, so it becomes an index-only scan. The leading case_id column
+    # covers plain case_id lookups, making the single-column index redundant.
+    # Built on the partitioned parent, so not CONCURRENTLY.
+    op.create_index(
+        'idx_ai_cost_tracking_case_created',
+        'ai_cost_tracking',
+        ['case_id', sa.text('created_at DESC')],
+        postgresql_include=['cost_usd', 'service_type']
+    )
+    op.drop_index('idx_ai_cost_tracking_case_id', table_name='ai_cost_tracking')
+
+
+def downgrade() -> None:
+    op.create_index('idx_ai_cost_tracking_case_id', 'ai_cost_tracking', ['case_id'])
+    op.drop_index('idx_ai_cost_tracking_case_created', table_name='ai_cost_tracking')
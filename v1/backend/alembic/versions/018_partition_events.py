@@ -0,0 +1,87 @@
+"""partition events by month
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migration_utils import backfill_paginated
+
+
+# revision identifiers, used by Alembic.
+revision = '018'
+down_revision = '017'
+branch_labels = None
+depends_on = None
+
+
+def _create_indexes() -> None:
+    op.create_index('idx_events_created_at', 'events', ['created_at'], postgresql_using='btree')
+    op.create_index(
+        'idx_events_aggregate_sequence',
+        'events',
+        ['aggregate_type', 'aggregate_id', 'sequence_number']
+    )
+    op.create_index(
+        'idx_events_case_number',
+        'events',
+        ['event_data_case_number'],
+        postgresql_where=sa.text('event_data_case_number IS NOT NULL')
+    )
+    op.create_index(
+        'idx_events_metadata_gin',
+        'events',
+        ['event_metadata'],
+        postgresql_using='gin',
+        postgresql_ops={'event_metadata': 'jsonb_path_ops'}
+    )
+
+
+def _replace_events_table(partitioned: bool) -> None:
+    """Recreate events (partitioned or plain) and copy the rows across"""
+    op.rename_table('events', 'events_old')
+
+    # LIKE copies the sequence_number default; the sequence itself is owned
+    # by the old column and would be dropped with it
+    op.execute("""
+        CREATE TABLE events (
+            LIKE events_old INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        )""" + (" PARTITION BY RANGE (created_at)" if partitioned else ""))
+    op.execute('ALTER SEQUENCE events_sequence_number_seq OWNED BY events.sequence_number')
+
+    if partitioned:
+        # One partition per month from the oldest event through two months
+        # ahead, plus a default partition so appends never fail for a missing
+        # month (create_monthly_partition comes from revision 007)
+        op.execute("""
+            SELECT create_monthly_partition('events', month::date)
+            FROM generate_series(
+                date_trunc('month', COALESCE((SELECT MIN(created_at) FROM events_old), now())),
+                date_trunc('month', now()) + interval '2 months',
+                interval '1 month'
+            ) AS month
+        """)
+        op.execute('CREATE TABLE events_default PARTITION OF events DEFAULT')
+
+    # Copy in committed batches; event_id leads the old primary key, so each
+    # page is an index range scan
+    backfill_paginated(op, 'events_old', 'events', key='event_id')
+    op.drop_table('events_old')
+
+
+def upgrade() -> None:
+    _replace_events_table(partitioned=True)
+
+    # Partition key must be part of the primary key
+    op.create_primary_key('events_pkey', 'events', ['event_id', 'sequence_number', 'created_at'])
+    _create_indexes()
+
+
+def downgrade() -> None:
+    _replace_events_table(partitioned=False)  # Drops all partitions
+
+    op.create_primary_key('events_pkey', 'events', ['event_id', 'sequence_number'])
+    _create_indexes()
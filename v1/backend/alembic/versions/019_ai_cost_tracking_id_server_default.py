@@ -0,0 +1,36 @@
+"""generate ai_cost_tracking ids in Postgres
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '019'
+down_revision = '018'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # events, cases and documents have had this default since 001/002; the
+    # cost table was created without one. gen_random_uuid() is built in
+    # (Postgres 13+), no pgcrypto needed. Inserts through the partitioned
+    # parent use its default.
+    op.alter_column(
+        'ai_cost_tracking', 'id',
+        existing_type=sa.UUID(),
+        server_default=sa.text('gen_random_uuid()')
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        'ai_cost_tracking', 'id',
+        existing_type=sa.UUID(),
+        server_default=None
+    )
@@ -1,22 +1,41 @@
 """Admin API endpoints for cost tracking and system management"""
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, or_, tuple_
 from datetime import datetime, timedelta
 from typing import Optional
+from uuid import UUID
 import logging
+import orjson
 
 from app.db.database import get_db
-from app.db.models import AICostTracking
+from app.db.models import AICostTracking, ai_cost_daily, case_ai_cost_summary
+from app.api.pagination import decode_cursor, encode_cursor
+from app.services.cache_service import get_cache_service, CacheService
 
-router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"], default_response_class=ORJSONResponse)
 logger = logging.getLogger(__name__)
 
+# Dashboard polls tolerate slightly stale numbers
+COST_SUMMARY_TTL_SECONDS = 60
+COST_STATS_TTL_SECONDS = 30
+
+
+def _cached_json(cache: CacheService, key: str, ttl_seconds: int, compute) -> Response:
+    """Serve a JSON body from cache, computing and storing it on a miss"""
+    body = cache.get(key)
+    if body is None:
+        body = orjson.dumps(compute())
+        cache.set(key, body, ttl_seconds)
+    return Response(content=body, media_type="application/json")
+
 
 @router.get("/costs/summary")
 def get_cost_summary(
     days: int = Query(default=7, ge=1, le=365, description="Number of days to analyze"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    cache: CacheService = Depends(get_cache_service)
 ):
     """
     Get cost summary for specified period
@@ -26,83 +45,106 @@ def get_cost_summary(
     - Spend by service type
     - Spend by model
     - Daily breakdown
+
+    Whole days are read from the mv_ai_cost_daily rollup; only the partial
+    first day and today are aggregated from ai_cost_tracking directly.
+    Responses are cached for COST_SUMMARY_TTL_SECONDS per `days` value.
     """
-    since_date = datetime.utcnow() - timedelta(days=days)
+    return _cached_json(
+        cache, f"cost_summary:{days}", COST_SUMMARY_TTL_SECONDS,
+        lambda: _compute_cost_summary(db, days)
+    )
+
 
-    # Total cost
-    total_cost = db.query(
-        func.sum(AICostTracking.cost_usd)
+def _compute_cost_summary(db: Session, days: int) -> dict:
+    """Aggregate the cost summary from the rollup view and base table"""
+    now = datetime.utcnow()
+    since_date = now - timedelta(days=days)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    first_full_day = since_date.date() + timedelta(days=1)
+
+    # Whole days between since_date and today come from the daily rollup view
+    rollup_rows = db.query(
+        ai_cost_daily.c.date,
+        ai_cost_daily.c.service_type,
+        ai_cost_daily.c.model_name,
+        ai_cost_daily.c.total_cost,
+        ai_cost_daily.c.request_count,
+        ai_cost_daily.c.total_input_tokens,
+        ai_cost_daily.c.total_output_tokens
     ).filter(
-        AICostTracking.created_at >= since_date
-    ).scalar() or 0
+        ai_cost_daily.c.date >= first_full_day,
+        ai_cost_daily.c.date < today_start.date()
+    ).all()
 
-    # Cost by service type
-    costs_by_service = db.query(
+    # The partial first day and today (not yet in the view) come from the base table
+    day = func.date(AICostTracking.created_at)
+    partial_rows = db.query(
+        day.label('date'),
         AICostTracking.service_type,
+        AICostTracking.model_name,
         func.sum(AICostTracking.cost_usd).label('total_cost'),
         func.count(AICostTracking.id).label('request_count'),
         func.sum(AICostTracking.input_tokens).label('total_input_tokens'),
         func.sum(AICostTracking.output_tokens).label('total_output_tokens')
     ).filter(
-        AICostTracking.created_at >= since_date
-    ).group_by(
-        AICostTracking.service_type
-    ).all()
-
-    # Cost by model
-    costs_by_model = db.query(
-        AICostTracking.model_name,
-        func.sum(AICostTracking.cost_usd).label('total_cost'),
-        func.count(AICostTracking.id).label('request_count')
-    ).filter(
-        AICostTracking.created_at >= since_date
+        AICostTracking.created_at >= since_date,
+        or_(
+            AICostTracking.created_at < datetime.combine(first_full_day, datetime.min.time()),
+            AICostTracking.created_at >= today_start
+        )
     ).group_by(
+        day,
+        AICostTracking.service_type,
         AICostTracking.model_name
     ).all()
 
-    # Daily breakdown
-    daily_costs = db.query(
-        func.date(AICostTracking.created_at).label('date'),
-        func.sum(AICostTracking.cost_usd).label('total_cost'),
-        func.count(AICostTracking.id).label('request_count')
-    ).filter(
-        AICostTracking.created_at >= since_date
-    ).group_by(
-        func.date(AICostTracking.created_at)
-    ).order_by(
-        desc('date')
-    ).all()
+    # Roll the (date, service, model) rows up into each breakdown
+    total_cost = 0.0
+    by_service = {}
+    by_model = {}
+    by_date = {}
+    for row in rollup_rows + partial_rows:
+        cost = float(row.total_cost or 0)
+        total_cost += cost
+
+        service = by_service.setdefault(row.service_type, {
+            "service_type": row.service_type,
+            "total_cost_usd": 0.0,
+            "request_count": 0,
+            "total_input_tokens": None,
+            "total_output_tokens": None
+        })
+        service["total_cost_usd"] += cost
+        service["request_count"] += row.request_count
+        if row.total_input_tokens is not None:
+            service["total_input_tokens"] = (service["total_input_tokens"] or 0) + row.total_input_tokens
+        if row.total_output_tokens is not None:
+            service["total_output_tokens"] = (service["total_output_tokens"] or 0) + row.total_output_tokens
+
+        model = by_model.setdefault(row.model_name, {
+            "model_name": row.model_name,
+            "total_cost_usd": 0.0,
+            "request_count": 0
+        })
+        model["total_cost_usd"] += cost
+        model["request_count"] += row.request_count
+
+        daily = by_date.setdefault(row.date, {
+            "date": row.date,
+            "total_cost_usd": 0.0,
+            "request_count": 0
+        })
+        daily["total_cost_usd"] += cost
+        daily["request_count"] += row.request_count
 
     return {
         "period_days": days,
-        "since_date": since_date.isoformat(),
-        "total_cost_usd": float(total_cost),
-        "costs_by_service": [
-            {
-                "service_type": row.service_type,
-                "total_cost_usd": float(row.total_cost),
-                "request_count": row.request_count,
-                "total_input_tokens": row.total_input_tokens,
-                "total_output_tokens": row.total_output_tokens
-            }
-            for row in costs_by_service
-        ],
-        "costs_by_model": [
-            {
-                "model_name": row.model_name,
-                "total_cost_usd": float(row.total_cost),
-                "request_count": row.request_count
-            }
-            for row in costs_by_model
-        ],
-        "daily_breakdown": [
-            {
-                "date": row.date.isoformat(),
-                "total_cost_usd": float(row.total_cost),
-                "request_count": row.request_count
-            }
-            for row in daily_costs
-        ]
+        "since_date": since_date,
+        "total_cost_usd": total_cost,
+        "costs_by_service": list(by_service.values()),
+        "costs_by_model": list(by_model.values()),
+        "daily_breakdown": [by_date[d] for d in sorted(by_date, reverse=True)]
     }
 
 
@@ -110,6 +152,10 @@ def get_cost_summary(
 def get_recent_costs(
     limit: int = Query(default=50, ge=1, le=1000, description="Number of recent records"),
     service_type: Optional[str] = Query(default=None, description="Filter by service type"),
+    extra_data: Optional[str] = Query(
+        default=None, description='Only records whose extra_data contains this JSON object, e.g. {"pages_processed": 3}'
+    ),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
     db: Session = Depends(get_db)
 ):
     """
@@ -122,76 +168,126 @@ def get_recent_costs(
     if service_type:
         query = query.filter(AICostTracking.service_type == service_type)
 
+    if extra_data:
+        try:
+            contained = orjson.loads(extra_data)
+        except orjson.JSONDecodeError:
+            contained = None
+        if not isinstance(contained, dict):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="extra_data must be a JSON object"
+            )
+        # @> so the filter is served by idx_ai_cost_tracking_extra_data_gin
+        query = query.filter(AICostTracking.extra_data.contains(contained))
+
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+        query = query.filter(tuple_(AICostTracking.created_at, AICostTracking.id) < (last_created_at, last_id))
+
     records = query.order_by(
-        desc(AICostTracking.created_at)
+        desc(AICostTracking.created_at),
+        desc(AICostTracking.id)
     ).limit(limit).all()
 
+    next_cursor = None
+    if len(records) == limit:
+        next_cursor = encode_cursor(records[-1].created_at, records[-1].id)
+
     return {
         "records": [
             {
-                "id": str(record.id),
+                "id": record.id,
                 "service_type": record.service_type,
                 "model_name": record.model_name,
-                "cost_usd": float(record.cost_usd),
+                "cost_usd": record.cost_usd,
                 "input_tokens": record.input_tokens,
                 "output_tokens": record.output_tokens,
                 "duration_ms": record.duration_ms,
                 "success": record.success,
-                "document_id": str(record.document_id) if record.document_id else None,
-                "case_id": str(record.case_id) if record.case_id else None,
-                "created_at": record.created_at.isoformat()
+                "document_id": record.document_id,
+                "case_id": record.case_id,
+                "created_at": record.created_at
             }
             for record in records
         ],
-        "total_records": len(records)
+        "total_records": len(records),
+        "next_cursor": next_cursor
+    }
+
+
+@router.get("/costs/cases/{case_id}")
+def get_case_costs(
+    case_id: UUID,
+    db: Session = Depends(get_db)
+):
+    """
+    Get AI spend for one case, per service
+
+    Read from the case_ai_cost_summary view, so calls made since its last
+    refresh (see cost_view_refresh_seconds) are not yet included.
+    """
+    rows = db.query(
+        case_ai_cost_summary.c.service_type,
+        case_ai_cost_summary.c.total_cost,
+        case_ai_cost_summary.c.calls,
+        case_ai_cost_summary.c.last_call
+    ).filter(
+        case_ai_cost_summary.c.case_id == case_id
+    ).order_by(case_ai_cost_summary.c.service_type).all()
+
+    return {
+        "case_id": case_id,
+        "total_cost_usd": sum(float(row.total_cost or 0) for row in rows),
+        "costs_by_service": [
+            {
+                "service_type": row.service_type,
+                "total_cost_usd": float(row.total_cost or 0),
+                "request_count": row.calls,
+                "last_call": row.last_call
+            }
+            for row in rows
+        ]
     }
 
 
 @router.get("/costs/stats")
-def get_cost_stats(db: Session = Depends(get_db)):
+def get_cost_stats(
+    db: Session = Depends(get_db),
+    cache: CacheService = Depends(get_cache_service)
+):
     """
     Get overall statistics
 
-    Returns high-level metrics
+    Returns high-level metrics (cached for COST_STATS_TTL_SECONDS)
     """
-    # Today's cost
-    today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-    today_cost = db.query(
-        func.sum(AICostTracking.cost_usd)
-    ).filter(
-        AICostTracking.created_at >= today_start
-    ).scalar() or 0
+    return _cached_json(cache, "cost_stats", COST_STATS_TTL_SECONDS, lambda: _compute_cost_stats(db))
 
-    # This week's cost
-    week_start = datetime.utcnow() - timedelta(days=7)
-    week_cost = db.query(
-        func.sum(AICostTracking.cost_usd)
-    ).filter(
-        AICostTracking.created_at >= week_start
-    ).scalar() or 0
 
-    # This month's cost
-    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    month_cost = db.query(
-        func.sum(AICostTracking.cost_usd)
-    ).filter(
-        AICostTracking.created_at >= month_start
-    ).scalar() or 0
+def _compute_cost_stats(db: Session) -> dict:
+    """Today/week/month totals in a single conditional-aggregate query"""
+    now = datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = now - timedelta(days=7)
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
 
-    # Total requests today
-    today_requests = db.query(
-        func.count(AICostTracking.id)
+    # Single pass over the widest window using conditional aggregates
+    in_today = AICostTracking.created_at >= today_start
+    stats = db.query(
+        func.sum(AICostTracking.cost_usd).filter(in_today).label('today_cost'),
+        func.sum(AICostTracking.cost_usd).filter(AICostTracking.created_at >= week_start).label('week_cost'),
+        func.sum(AICostTracking.cost_usd).filter(AICostTracking.created_at >= month_start).label('month_cost'),
+        func.count(AICostTracking.id).filter(in_today).label('today_requests'),
+        func.count(AICostTracking.id).filter(in_today, AICostTracking.success == True).label('today_success')
     ).filter(
-        AICostTracking.created_at >= today_start
-    ).scalar() or 0
+        AICostTracking.created_at >= min(week_start, month_start)
+    ).one()
 
-    # Success rate today
-    today_success = db.query(
-        func.count(AICostTracking.id)
-    ).filter(
-        AICostTracking.created_at >= today_start,
-        AICostTracking.success == True
-    ).scalar() or 0
+    today_cost = stats.today_cost or 0
+    week_cost = stats.week_cost or 0
+    month_cost = stats.month_cost or 0
+    today_requests = stats.today_requests or 0
+    today_success = stats.today_success or 0
 
     success_rate = (today_success / today_requests * 100) if today_requests > 0 else 100
 
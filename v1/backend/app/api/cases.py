@@ -1,74 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 from uuid import UUID
 
-from app.db.database import get_db
+from app.db.database import get_async_db
 from app.db.models import Case, Event
-from app.api.schemas import CaseCreate, CaseUpdate, CaseResponse
+from app.api.schemas import CaseCreate, CaseUpdate, CaseResponse, CASE_LIST_ADAPTER
+from app.api.pagination import decode_cursor, set_next_cursor
 from app.domain.commands import CreateCaseCommand
 from app.domain.events import CaseCreatedEvent
 
 router = APIRouter()
 
+CASE_RESPONSE_COLUMNS = (
+    Case.case_id,
+    Case.title,
+    Case.case_number,
+    Case.status,
+    Case.case_metadata,
+    Case.created_at,
+    Case.updated_at,
+)
+
 
 @router.post("/", response_model=CaseResponse, status_code=status.HTTP_201_CREATED)
-async def create_case(case_data: CaseCreate, db: Session = Depends(get_db)):
+async def create_case(case_data: CaseCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new case"""
 
-    # Check if case number already exists
-    existing = db.query(Case).filter(Case.case_number == case_data.case_number).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Case number '{case_data.case_number}' already exists"
-        )
-
-    # Create case (read model)
-    new_case = Case(
+    # Insert unless the case number is taken - one atomic round trip, no race.
+    # RETURNING hands back the generated id and timestamps without a refresh.
+    stmt = insert(Case).values(
         title=case_data.title,
         case_number=case_data.case_number,
         status="draft",
         case_metadata=case_data.metadata or {}
-    )
-    db.add(new_case)
-    db.flush()  # Flush to generate case_id from database
+    ).on_conflict_do_nothing(
+        index_elements=[Case.case_number]
+    ).returning(Case)
+
+    new_case = (await db.execute(stmt)).scalar_one_or_none()
+    if new_case is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Case number '{case_data.case_number}' already exists"
+        )
 
     # Create event (event store)
     event = Event(
         aggregate_type="case",
         aggregate_id=new_case.case_id,
         event_type="CaseCreated",
-        event_data={
-            "title": case_data.title,
-            "case_number": case_data.case_number,
-            "metadata": case_data.metadata or {}
-        },
+        event_data_title=case_data.title,
+        event_data_case_number=case_data.case_number,
+        event_data={"metadata": case_data.metadata or {}},
         event_metadata={"source": "api"}
     )
     db.add(event)
 
-    db.commit()
-    db.refresh(new_case)
+    await db.commit()
 
     return new_case
 
 
 @router.get("/", response_model=List[CaseResponse])
 async def list_cases(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all cases"""
-    cases = db.query(Case).order_by(Case.created_at.desc()).offset(skip).limit(limit).all()
-    return cases
+    """
+    List all cases
+
+    Pass the X-Next-Cursor header of the previous page as `cursor` for keyset
+    pagination; `skip` is still honoured when no cursor is given.
+    """
+    # Plain column rows: no identity map or attribute instrumentation per row
+    stmt = select(*CASE_RESPONSE_COLUMNS)
+    if cursor:
+        last_created_at, last_case_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Case.created_at, Case.case_id) < (last_created_at, last_case_id))
+    elif skip:
+        stmt = stmt.offset(skip)
+
+    rows = (await db.execute(stmt.order_by(Case.created_at.desc(), Case.case_id.desc()).limit(limit))).all()
+    set_next_cursor(response, rows, limit, "case_id")
+    return CASE_LIST_ADAPTER.validate_python(rows, from_attributes=True)
 
 
 @router.get("/{case_id}", response_model=CaseResponse)
-async def get_case(case_id: UUID, db: Session = Depends(get_db)):
+async def get_case(case_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Get a specific case by ID"""
-    case = db.query(Case).filter(Case.case_id == case_id).first()
+    case = await db.get(Case, case_id)
     if not case:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -81,10 +107,10 @@ async def get_case(case_id: UUID, db: Session = Depends(get_db)):
 async def update_case(
     case_id: UUID,
     case_update: CaseUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a case"""
-    case = db.query(Case).filter(Case.case_id == case_id).first()
+    case = await db.get(Case, case_id)
     if not case:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -106,16 +132,16 @@ async def update_case(
     )
     db.add(event)
 
-    db.commit()
-    db.refresh(case)
+    await db.commit()
+    await db.refresh(case)  # Pick up server-side updated_at
 
     return case
 
 
 @router.delete("/{case_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_case(case_id: UUID, db: Session = Depends(get_db)):
+async def delete_case(case_id: UUID, db: AsyncSession = Depends(get_async_db)):
     """Delete a case"""
-    case = db.query(Case).filter(Case.case_id == case_id).first()
+    case = await db.get(Case, case_id)
     if not case:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -132,7 +158,7 @@ async def delete_case(case_id: UUID, db: Session = Depends(get_db)):
     )
     db.add(event)
 
-    db.delete(case)
-    db.commit()
+    await db.delete(case)
+    await db.commit()
 
     return None
@@ -1,19 +1,37 @@
 """Documents API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Body, Depends, HTTPException, status, UploadFile, File, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    any_, case, cast, delete, exists, func, insert, Integer, JSON, literal, literal_column, or_, select, String, Text, true, tuple_, update
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.engine import Row
+from typing import List, Optional
 from uuid import UUID
 import uuid
-from datetime import datetime
+from uuid6 import uuid7
+from datetime import datetime, timedelta
 from pathlib import Path
-import re
+import string
+import hashlib
+import io
 import logging
+import orjson
+import time
 
-from app.db.database import get_db
-from app.db.models import Document, Event, Case
+from app.db.database import get_async_db
+from app.db.models import Document, DocumentAnnotation, Event, Case
+from app.domain.events import DocumentAnalysisStartedEvent
 from app.api.schemas import (
+    DocumentListItem,
     DocumentResponse,
     DocumentUploadResponse,
+    DocumentPresignRequest,
+    DocumentPresignResponse,
+    DocumentFinalizeRequest,
     DocumentAnalysisResponse,
     AnalyzeDocumentRequest,
     BulkAnalyzeRequest,
@@ -21,9 +39,23 @@ from app.api.schemas import (
     DocumentPreviewUrl,
     AnalysisUpdateRequest,
     AnnotationCreate,
-    AnnotationResponse
+    AnnotationResponse,
+    ANNOTATION_CREATE_LIST_ADAPTER,
+    ANNOTATION_LIST_ADAPTER,
+    MAX_BULK_ANNOTATIONS,
+    DOCUMENT_LIST_ADAPTER
+)
+from app.api.pagination import decode_cursor, set_next_cursor, TOTAL_COUNT_HEADER
+from app.services import (
+    get_s3_service,
+    S3Service,
+    get_ai_service
 )
-from app.services.s3_service import get_s3_service, S3Service
+from app.services.cost_tracking_service import daily_spend_query
+from app.services.document_pipeline import document_metadata_update
+from app.services.export_service import ExportService
+from app.services.analysis_queue import enqueue_document_analysis, enqueue_bulk_analysis
+from app.services.cache_service import get_cache_service, CacheService
 
 logger = logging.getLogger(__name__)
 
@@ -39,201 +71,627 @@ ALLOWED_EXTENSIONS = {
     'png': 'image/png',
     'txt': 'text/plain',
 }
+ALLOWED_CONTENT_TYPES = frozenset(ALLOWED_EXTENSIONS.values())
+ALLOWED_EXTENSIONS_LIST = ', '.join(ALLOWED_EXTENSIONS)  # For error messages
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+MULTIPART_OVERHEAD = 64 * 1024  # Slack for multipart boundaries/headers in Content-Length
+FOREIGN_KEY_VIOLATION = '23503'  # PostgreSQL SQLSTATE
+UNIQUE_VIOLATION = '23505'  # PostgreSQL SQLSTATE
+PRESIGNED_UPLOAD_EXPIRY = 900  # 15 minutes
+DOC_COUNT_TTL_SECONDS = 300  # Per-case document count cache; invalidated on upload/delete
+PREVIEW_URL_EXPIRY = 3600  # 1 hour
+# A cached preview URL is handed out again while at least this much of it remains
+PREVIEW_URL_MIN_REMAINING = 300
+
+# Columns behind AnnotationResponse
+ANNOTATION_COLUMNS = (
+    cast(DocumentAnnotation.annotation_id, String).label("id"),
+    DocumentAnnotation.page,
+    DocumentAnnotation.rects,
+    DocumentAnnotation.color,
+    DocumentAnnotation.text,
+    DocumentAnnotation.created_at,
+)
+
+# Per-document lookups; exactly the columns idx_documents_id_case_covering carries
+DOCUMENT_LOOKUP_COLUMNS = (Document.s3_key, Document.file_type, Document.original_filename)
+
+# What the exports read: the filename and three sections of document_metadata
+EXPORT_COLUMNS = (
+    Document.original_filename,
+    Document.document_metadata["analysis"].label("analysis"),
+    Document.document_metadata["entities"].label("entities"),
+    Document.document_metadata["extraction"].label("extraction"),
+)
+
+# Columns behind DocumentListItem; list pages never load document_metadata
+DOCUMENT_LIST_COLUMNS = (
+    Document.document_id,
+    Document.case_id,
+    Document.filename,
+    Document.original_filename,
+    Document.file_type,
+    Document.file_size,
+    Document.s3_key,
+    Document.s3_bucket,
+    Document.status,
+    Document.created_at,
+    Document.updated_at,
+)
+
+
+_SAFE_FILENAME_CHARS = frozenset(string.ascii_letters + string.digits + '._-')
+
+
+class _FilenameTranslation(dict):
+    """str.translate table: safe characters map to themselves, anything else to '_'"""
+
+    def __missing__(self, codepoint: int) -> int:
+        mapped = codepoint if chr(codepoint) in _SAFE_FILENAME_CHARS else ord('_')
+        self[codepoint] = mapped
+        return mapped
+
+
+_FILENAME_TRANSLATION = _FilenameTranslation()
 
 
 def sanitize_filename(filename: str) -> str:
     """Sanitize filename for safe storage"""
     # Remove path components
-    filename = filename.split('/')[-1].split('\\')[-1]
-    # Remove special characters except dots, underscores, hyphens
-    filename = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
-    return filename
+    filename = filename.rpartition('/')[2].rpartition('\\')[2]
+    # Replace special characters except dots, underscores, hyphens
+    return filename.translate(_FILENAME_TRANSLATION)
 
 
-def validate_file(file: UploadFile) -> tuple[bool, str]:
+def validate_file(extension: str, content_type: Optional[str] = None) -> tuple[bool, str, str]:
     """
     Validate uploaded file
 
+    Args:
+        extension: Lower-cased extension of the filename
+        content_type: Content type declared by the client, if any
+
     Returns:
-        (is_valid, error_message)
+        (is_valid, error_message, content type to store the file with)
     """
-    # Check filename
-    if not file.filename:
-        return False, "No filename provided"
-
-    # Check extension
-    extension = file.filename.rsplit('.', 1)[-1].lower()
-    if extension not in ALLOWED_EXTENSIONS:
-        return False, f"File type '.{extension}' not allowed. Allowed: {', '.join(ALLOWED_EXTENSIONS.keys())}"
+    # Check extension (one dict lookup also yields the stored content type)
+    stored_content_type = ALLOWED_EXTENSIONS.get(extension)
+    if stored_content_type is None:
+        return False, f"File type '.{extension}' not allowed. Allowed: {ALLOWED_EXTENSIONS_LIST}", ""
 
     # Check content type (if provided)
-    if file.content_type and file.content_type not in ALLOWED_EXTENSIONS.values():
-        return False, f"Content type '{file.content_type}' not allowed"
+    if content_type and content_type not in ALLOWED_CONTENT_TYPES:
+        return False, f"Content type '{content_type}' not allowed", ""
 
-    return True, ""
+    return True, "", stored_content_type
 
 
-def generate_s3_key(case_id: UUID, filename: str) -> str:
+def generate_s3_key(case_id: UUID, sanitized_name: str, unique_id: Optional[UUID] = None) -> str:
     """
     Generate unique S3 key for document
 
-    Format: cases/{case_id}/documents/{uuid}_{filename}
+    Format: cases/{case_id}/documents/{uuid}_{sanitized_name}
     """
-    unique_id = uuid.uuid4()
-    sanitized_name = sanitize_filename(filename)
+    if unique_id is None:
+        unique_id = uuid.uuid4()
     return f"cases/{case_id}/documents/{unique_id}_{sanitized_name}"
 
 
+def doc_count_cache_key(case_id: UUID) -> str:
+    """Redis key holding the number of documents in a case"""
+    return f"case:{case_id}:doc_count"
+
+
+def preview_url_cache_key(s3_key: str) -> str:
+    """Redis key holding the presigned preview URL of an object"""
+    return f"s3:presign:{s3_key}"
+
+
+async def ensure_case_exists(db: AsyncSession, case_id: UUID) -> None:
+    """
+    Raise 404 if the case does not exist
+
+    Document queries already filter on case_id, so call this only when they
+    come back empty, to tell "no such case" from "no such document".
+    """
+    if not await db.scalar(select(exists().where(Case.case_id == case_id))):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Case with ID {case_id} not found"
+        )
+
+
+async def ensure_case_document(db: AsyncSession, case_id: UUID, document_id: UUID) -> None:
+    """Raise 404 unless the document belongs to the case, without loading it"""
+    found = await db.scalar(
+        select(Document.document_id).where(
+            Document.document_id == document_id,
+            Document.case_id == case_id
+        )
+    )
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document with ID {document_id} not found in case {case_id}"
+        )
+
+
+async def get_case_document(db: AsyncSession, case_id: UUID, document_id: UUID, *columns) -> Row:
+    """
+    Load only the given columns of a document of the case, or raise 404
+
+    Selecting DOCUMENT_LOOKUP_COLUMNS alone is an index-only scan
+    (idx_documents_id_case_covering); document_metadata is never read
+    unless asked for.
+    """
+    document = (await db.execute(
+        select(*columns).where(
+            Document.document_id == document_id,
+            Document.case_id == case_id
+        )
+    )).first()
+
+    if not document:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document with ID {document_id} not found in case {case_id}"
+        )
+    return document
+
+
+async def get_document_or_404(
+    case_id: UUID,
+    document_id: UUID,
+    db: AsyncSession = Depends(get_async_db)
+) -> Row:
+    """
+    Dependency: the document's lookup columns (DOCUMENT_LOOKUP_COLUMNS), or 404
+
+    Every handler using it runs the same statement, so it shares one
+    compiled statement (and, unless behind PgBouncer, one prepared statement).
+    """
+    return await get_case_document(db, case_id, document_id, *DOCUMENT_LOOKUP_COLUMNS)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether If-None-Match names etag (weak comparison)"""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and etag in (
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    )
+
+
+def audit_event_cte(source, event_type: str, event_data, event_metadata: dict):
+    """
+    INSERT of a document event as a CTE over the rows of another CTE
+
+    Attach with .add_cte() to the statement that makes the change, so the
+    change and its audit event are a single statement: one event is
+    written per row the change actually touched (source must expose
+    document_id). event_data is a dict, or a JSON expression over
+    source's columns for per-row payloads.
+    """
+    if isinstance(event_data, dict):
+        event_data = cast(event_data, JSON)
+    # event_id is left to its server default, so every row gets its own
+    return insert(Event).from_select(
+        ["aggregate_type", "aggregate_id", "event_type", "event_data", "event_metadata"],
+        select(
+            literal("document", String),
+            source.c.document_id,
+            literal(event_type, String),
+            event_data,
+            cast(event_metadata, JSONB)
+        )
+    ).cte("audit_event")
+
+
+def document_id_in(ids: List[UUID]):
+    """
+    Document.document_id = ANY(:ids::uuid[])
+
+    Binds the ids as one array parameter instead of expanding IN (...), so
+    the statement text (and any prepared plan) is the same for every batch
+    size.
+    """
+    return Document.document_id == any_(cast(ids, ARRAY(PG_UUID(as_uuid=True))))
+
+
+async def iter_buffer_chunks(buffer: io.BytesIO, chunk_size: int = 64 * 1024):
+    """Stream an in-memory file in fixed-size chunks (no copy of the whole buffer)"""
+    view = buffer.getbuffer()
+    try:
+        for offset in range(buffer.tell(), len(view), chunk_size):
+            yield bytes(view[offset:offset + chunk_size])
+    finally:
+        view.release()
+
+
+class FileTooLargeError(Exception):
+    """Raised mid-stream once an upload passes MAX_FILE_SIZE"""
+
+
+class CountingReader(io.RawIOBase):
+    """
+    Read-through wrapper that counts bytes and hashes them as they stream
+
+    Lets the S3 upload be the only pass over the body: size and SHA-256 are
+    known once the upload finishes, without seeking to the end first. With a
+    limit, reading stops as soon as it is exceeded, which aborts the
+    (multipart) upload instead of shipping the rest of an oversized file.
+    """
+
+    def __init__(self, inner, limit: Optional[int] = None):
+        self.inner = inner
+        self.limit = limit
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+
+    def readable(self) -> bool:
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.inner.read(size)
+        self.size += len(chunk)
+        if self.limit is not None and self.size > self.limit:
+            raise FileTooLargeError(f"Upload exceeds {self.limit} bytes")
+        self.sha256.update(chunk)
+        return chunk
+
+
 @router.post("/", response_model=DocumentUploadResponse, status_code=status.HTTP_201_CREATED)
 async def upload_document(
     case_id: UUID,
+    request: Request,
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     s3_service: S3Service = Depends(get_s3_service)
 ):
     """Upload a document to a case"""
 
-    # Verify case exists
-    case = db.query(Case).filter(Case.case_id == case_id).first()
-    if not case:
+    # Reject oversized requests from the header before touching the body
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_FILE_SIZE + MULTIPART_OVERHEAD:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Case with ID {case_id} not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size exceeds maximum ({MAX_FILE_SIZE} bytes)"
         )
 
+    if not file.filename:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No filename provided"
+        )
+
+    # Derive everything filename-based once
+    extension = file.filename.rpartition('.')[2].lower()
+    sanitized_name = sanitize_filename(file.filename)
+
     # Validate file
-    is_valid, error_msg = validate_file(file)
+    is_valid, error_msg, content_type = validate_file(extension, file.content_type)
     if not is_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=error_msg
         )
 
-    # Check file size
-    file.file.seek(0, 2)  # Seek to end
-    file_size = file.file.tell()
-    file.file.seek(0)  # Reset to beginning
+    # Generate S3 key
+    s3_key = generate_s3_key(case_id, sanitized_name)
 
-    if file_size > MAX_FILE_SIZE:
+    # Upload to S3 (multipart, in a worker thread so the event loop stays free).
+    # Size and content hash are collected while boto3 reads the body.
+    reader = CountingReader(file.file, limit=MAX_FILE_SIZE)
+    try:
+        upload_success = await run_in_threadpool(
+            s3_service.upload_file,
+            file_obj=reader,
+            s3_key=s3_key,
+            content_type=content_type,
+            metadata={
+                'case_id': str(case_id),
+                'original_filename': file.filename,
+                'uploaded_at': datetime.utcnow().isoformat()
+            }
+        )
+    except FileTooLargeError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File size ({file_size} bytes) exceeds maximum ({MAX_FILE_SIZE} bytes)"
+            detail=f"File size exceeds maximum ({MAX_FILE_SIZE} bytes)"
+        )
+
+    if not upload_success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to upload file to storage"
         )
 
+    # The reader already enforced the upper bound while streaming
+    file_size = reader.size
     if file_size == 0:
+        await run_in_threadpool(s3_service.delete_file, s3_key)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="File is empty"
         )
 
-    # Generate S3 key
-    s3_key = generate_s3_key(case_id, file.filename)
-
-    # Get content type
-    extension = file.filename.rsplit('.', 1)[-1].lower()
-    content_type = ALLOWED_EXTENSIONS.get(extension, 'application/octet-stream')
-
-    # Upload to S3
-    upload_success = s3_service.upload_file(
-        file_obj=file.file,
+    return await _record_document(
+        db,
+        s3_service,
+        case_id=case_id,
         s3_key=s3_key,
+        sanitized_name=sanitized_name,
+        original_filename=file.filename,
         content_type=content_type,
-        metadata={
-            'case_id': str(case_id),
-            'original_filename': file.filename,
-            'uploaded_at': datetime.utcnow().isoformat()
-        }
+        file_size=file_size,
+        content_hash=reader.sha256.hexdigest()
     )
 
-    if not upload_success:
+
+@router.post("/presign", response_model=DocumentPresignResponse, status_code=status.HTTP_201_CREATED)
+async def presign_document_upload(
+    case_id: UUID,
+    presign_request: DocumentPresignRequest,
+    s3_service: S3Service = Depends(get_s3_service)
+):
+    """
+    Start a direct-to-storage upload
+
+    Returns a presigned POST (URL + form fields) so the file body goes
+    straight to S3 instead of through the API; S3 enforces the size limit.
+    Call POST /{document_id}/finalize once the upload succeeds to register
+    the document.
+    """
+    extension = presign_request.filename.rpartition('.')[2].lower()
+    is_valid, error_msg, content_type = validate_file(extension)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+
+    if presign_request.file_size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File size ({presign_request.file_size} bytes) exceeds maximum ({MAX_FILE_SIZE} bytes)"
+        )
+
+    # The document id doubles as the key prefix so finalize can rebuild the key
+    document_id = uuid.uuid4()
+    s3_key = generate_s3_key(case_id, sanitize_filename(presign_request.filename), document_id)
+
+    upload = s3_service.get_upload_post(
+        s3_key,
+        content_type=content_type,
+        max_size=MAX_FILE_SIZE,
+        expiration=PRESIGNED_UPLOAD_EXPIRY
+    )
+    if not upload:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to upload file to storage"
+            detail="Failed to generate upload URL"
+        )
+
+    return DocumentPresignResponse(
+        document_id=document_id,
+        upload_url=upload['url'],
+        upload_fields=upload['fields'],
+        content_type=content_type,
+        expires_at=datetime.utcnow() + timedelta(seconds=PRESIGNED_UPLOAD_EXPIRY)
+    )
+
+
+@router.post("/{document_id}/finalize", response_model=DocumentUploadResponse, status_code=status.HTTP_201_CREATED)
+async def finalize_document_upload(
+    case_id: UUID,
+    document_id: UUID,
+    finalize_request: DocumentFinalizeRequest,
+    db: AsyncSession = Depends(get_async_db),
+    s3_service: S3Service = Depends(get_s3_service)
+):
+    """Register a document uploaded through a presigned URL"""
+    extension = finalize_request.filename.rpartition('.')[2].lower()
+    is_valid, error_msg, content_type = validate_file(extension)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=error_msg
+        )
+
+    sanitized_name = sanitize_filename(finalize_request.filename)
+    s3_key = generate_s3_key(case_id, sanitized_name, document_id)
+
+    # Trust what S3 actually stored, not what the client claimed at presign
+    file_info = await run_in_threadpool(s3_service.get_file_info, s3_key)
+    if file_info is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Uploaded file not found in storage"
         )
 
-    # Create document record (read model)
-    document = Document(
+    file_size = file_info['ContentLength']
+    if file_size > MAX_FILE_SIZE or file_size == 0:
+        await run_in_threadpool(s3_service.delete_file, s3_key)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"File size ({file_size} bytes) exceeds maximum ({MAX_FILE_SIZE} bytes)"
+                if file_size else "File is empty"
+            )
+        )
+
+    return await _record_document(
+        db,
+        s3_service,
+        document_id=document_id,
         case_id=case_id,
-        filename=sanitize_filename(file.filename),
-        original_filename=file.filename,
-        file_type=content_type,
-        file_size=file_size,
         s3_key=s3_key,
-        s3_bucket=s3_service.bucket_name,
-        status="uploaded",
-        document_metadata={}
+        sanitized_name=sanitized_name,
+        original_filename=finalize_request.filename,
+        content_type=content_type,
+        file_size=file_size,
+        document_metadata={"etag": file_info.get('ETag', '').strip('"')}
     )
-    db.add(document)
-    db.flush()  # CRITICAL: Generate document_id before creating event
 
-    # Create event (event store)
-    event = Event(
+
+async def _record_document(
+    db: AsyncSession,
+    s3_service: S3Service,
+    *,
+    case_id: UUID,
+    s3_key: str,
+    sanitized_name: str,
+    original_filename: str,
+    content_type: str,
+    file_size: int,
+    document_metadata: Optional[dict] = None,
+    content_hash: Optional[str] = None,
+    document_id: Optional[UUID] = None
+) -> DocumentUploadResponse:
+    """
+    Write the Document read model row and its DocumentUploaded event
+
+    The object must already be in S3. If the case does not exist the object
+    is removed again and a 404 is raised.
+    """
+    registering_known_id = document_id is not None
+    if document_id is None:
+        document_id = uuid.uuid4()
+
+    # The event rides along as a data-modifying CTE of the document INSERT:
+    # one statement, one round trip. The id is generated here so the event
+    # can reference it, and RETURNING hands back the server-side timestamps.
+    event_cte = insert(Event).values(
         aggregate_type="document",
-        aggregate_id=document.document_id,
+        aggregate_id=document_id,
         event_type="DocumentUploaded",
         event_data={
-            "case_id": str(case_id),
-            "filename": document.filename,
-            "original_filename": document.original_filename,
+            "case_id": case_id,
+            "filename": sanitized_name,
+            "original_filename": original_filename,
             "file_type": content_type,
             "file_size": file_size,
             "s3_key": s3_key,
         },
-        event_metadata={"source": "api", "case_id": str(case_id)}
-    )
-    db.add(event)
+        event_metadata={"source": "api", "case_id": case_id}
+    ).cte("document_uploaded_event")
 
-    db.commit()
-    db.refresh(document)
+    stmt = insert(Document).values(
+        document_id=document_id,
+        case_id=case_id,
+        filename=sanitized_name,
+        original_filename=original_filename,
+        file_type=content_type,
+        file_size=file_size,
+        s3_key=s3_key,
+        s3_bucket=s3_service.bucket_name,
+        status="uploaded",
+        document_metadata=document_metadata,
+        content_hash=content_hash
+    ).add_cte(event_cte).returning(Document)
 
-    return DocumentUploadResponse(
-        document=document,
+    try:
+        document = (await db.execute(stmt)).scalar_one()
+    except IntegrityError as e:
+        await db.rollback()
+        pgcode = getattr(e.orig, "pgcode", None)
+        if pgcode == UNIQUE_VIOLATION and registering_known_id:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Document {document_id} is already registered"
+            )
+        if pgcode != FOREIGN_KEY_VIOLATION:
+            raise
+        # No separate case lookup: the documents.case_id FK rejects unknown cases
+        await run_in_threadpool(s3_service.delete_file, s3_key)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Case with ID {case_id} not found"
+        )
+
+    # Serialize before commit: commit expires the instance and reading it
+    # afterwards would reload it with another SELECT
+    upload_response = DocumentUploadResponse(
+        document=DocumentResponse.model_validate(document),
         message="Document uploaded successfully"
     )
+    await db.commit()
+    await run_in_threadpool(get_cache_service().delete, doc_count_cache_key(case_id))
+
+    return upload_response
 
 
-@router.get("/", response_model=List[DocumentResponse])
+@router.get("/", response_model=List[DocumentListItem])
 async def list_documents(
     case_id: UUID,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    cache: CacheService = Depends(get_cache_service)
 ):
-    """List all documents for a case"""
+    """
+    List all documents for a case
 
-    # Verify case exists
-    case = db.query(Case).filter(Case.case_id == case_id).first()
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Case with ID {case_id} not found"
+    Pass the X-Next-Cursor header of the previous page as `cursor` for keyset
+    pagination; `skip` is still honoured when no cursor is given. The first
+    page also carries the case's document count in X-Total-Count.
+    Items omit document_metadata; fetch a single document for it.
+    """
+    # Plain column rows, served from idx_documents_case_created_id order
+    stmt = select(*DOCUMENT_LIST_COLUMNS).where(Document.case_id == case_id)
+    if cursor:
+        last_created_at, last_document_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            tuple_(Document.created_at, Document.document_id) < (last_created_at, last_document_id)
         )
+    elif skip:
+        stmt = stmt.offset(skip)
 
-    documents = (
-        db.query(Document)
-        .filter(Document.case_id == case_id)
-        .order_by(Document.created_at.desc())
-        .offset(skip)
+    documents = (await db.execute(
+        stmt
+        .order_by(Document.created_at.desc(), Document.document_id.desc())
         .limit(limit)
-        .all()
-    )
+    )).all()
+    set_next_cursor(response, documents, limit, "document_id")
+
+    # Only an empty page needs to tell "no documents" from "no such case"
+    if not documents:
+        await ensure_case_exists(db, case_id)
+
+    if not cursor and not skip:
+        response.headers[TOTAL_COUNT_HEADER] = str(await _count_documents(db, cache, case_id, documents, limit))
+
+    return DOCUMENT_LIST_ADAPTER.validate_python(documents, from_attributes=True)
+
+
+async def _count_documents(db: AsyncSession, cache: CacheService, case_id: UUID, first_page: list, limit: int) -> int:
+    """Document count for a case: from the first page if it is partial, else cached"""
+    if len(first_page) < limit:
+        return len(first_page)
+
+    # The cache client is sync: keep its round trips off the event loop
+    key = doc_count_cache_key(case_id)
+    cached = await run_in_threadpool(cache.get, key)
+    if cached is not None:
+        return int(cached)
 
-    return documents
+    # Index-only scan of idx_documents_case_created_id
+    total = await db.scalar(select(func.count()).where(Document.case_id == case_id))
+    await run_in_threadpool(cache.set, key, str(total).encode(), DOC_COUNT_TTL_SECONDS)
+    return total
 
 
 @router.get("/{document_id}", response_model=DocumentResponse)
 async def get_document(
     case_id: UUID,
     document_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific document"""
 
-    document = (
-        db.query(Document)
-        .filter(Document.document_id == document_id, Document.case_id == case_id)
-        .first()
+    document = await db.scalar(
+        select(Document).where(Document.document_id == document_id, Document.case_id == case_id)
     )
 
     if not document:
@@ -249,15 +707,13 @@ async def get_document(
 async def delete_document(
     case_id: UUID,
     document_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     s3_service: S3Service = Depends(get_s3_service)
 ):
     """Delete a document"""
 
-    document = (
-        db.query(Document)
-        .filter(Document.document_id == document_id, Document.case_id == case_id)
-        .first()
+    document = await db.scalar(
+        select(Document).where(Document.document_id == document_id, Document.case_id == case_id)
     )
 
     if not document:
@@ -266,8 +722,8 @@ async def delete_document(
             detail=f"Document with ID {document_id} not found in case {case_id}"
         )
 
-    # Delete from S3
-    s3_delete_success = s3_service.delete_file(document.s3_key)
+    # Delete from S3 (in a worker thread so the event loop stays free)
+    s3_delete_success = await run_in_threadpool(s3_service.delete_file, document.s3_key)
     if not s3_delete_success:
         # Log error but continue with database deletion
         # The file might already be deleted or S3 might be temporarily unavailable
@@ -279,17 +735,18 @@ async def delete_document(
         aggregate_id=document_id,
         event_type="DocumentDeleted",
         event_data={
-            "case_id": str(case_id),
+            "case_id": case_id,
             "filename": document.filename,
             "s3_key": document.s3_key
         },
-        event_metadata={"source": "api", "case_id": str(case_id)}
+        event_metadata={"source": "api", "case_id": case_id}
     )
     db.add(event)
 
     # Delete from database
-    db.delete(document)
-    db.commit()
+    await db.delete(document)
+    await db.commit()
+    await run_in_threadpool(get_cache_service().delete, doc_count_cache_key(case_id))
 
     return None
 
@@ -298,302 +755,12 @@ async def delete_document(
 # AI Analysis Endpoints
 # ============================================================================
 
-async def process_document_background(
-    document_id: UUID,
-    case_id: UUID,
-    db_session: Session
-):
-    """
-    Background task for document AI processing
-
-    Steps:
-    1. Download document from S3
-    2. Extract text
-    3. Quality check
-    4. AI analysis (Claude + GPT-4)
-    5. Store results in document_metadata
-    6. Emit events at each stage
-    """
-    from app.services import (
-        get_s3_service,
-        get_text_extraction_service,
-        get_ai_service,
-        get_vision_ai_service
-    )
-    from app.services.cost_tracking_service import get_cost_tracking_service
-    from app.domain.events import (
-        DocumentTextExtractedEvent,
-        DocumentAnalyzedEvent,
-        DocumentAnalysisFailedEvent
-    )
-    import tempfile
-    import os
-
-    s3_service = get_s3_service()
-    text_service = get_text_extraction_service()
-    ai_service = get_ai_service()
-
-    tmp_path = None
-
-    try:
-        # Get document
-        document = db_session.query(Document).filter(
-            Document.document_id == document_id
-        ).first()
-
-        if not document:
-            logger.error(f"Document {document_id} not found")
-            return
-
-        # 1. Download from S3 to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(document.filename).suffix) as tmp:
-            tmp_path = tmp.name
-
-        download_success = s3_service.download_file(document.s3_key, tmp_path)
-        if not download_success:
-            raise Exception("Failed to download file from S3")
-
-        # 2. Extract text
-        extraction_result = text_service.extract_text(tmp_path, document.file_type)
-
-        # Create extraction event
-        event = Event(
-            aggregate_type="document",
-            aggregate_id=document_id,
-            event_type="DocumentTextExtracted",
-            event_data={
-                "case_id": str(case_id),
-                "text_length": extraction_result["text_length"],
-                "quality_score": extraction_result["quality_score"],
-                "extraction_method": extraction_result["method"]
-            },
-            event_metadata={"source": "ai_processing"}
-        )
-        db_session.add(event)
-        db_session.commit()
-
-        # 3. Quality check and Vision AI fallback
-        if extraction_result.get("needs_vision_fallback", False):
-            logger.info(
-                f"Poor text quality ({extraction_result['quality_score']}), "
-                f"attempting Vision AI fallback for document {document_id}"
-            )
-
-            try:
-                vision_service = get_vision_ai_service()
-                vision_result = vision_service.analyze_document(
-                    tmp_path,
-                    document_type="legal"
-                )
-
-                if vision_result.get("success") and vision_result.get("text"):
-                    # Vision AI succeeded - use its results
-                    logger.info(
-                        f"Vision AI extraction successful: {vision_result['text_length']} chars, "
-                        f"cost: ${vision_result['metadata'].get('cost_usd', 0):.4f}"
-                    )
-                    # Normalize vision_result structure to match text extraction format
-                    extraction_result = {
-                        "text": vision_result["text"],
-                        "text_length": vision_result["text_length"],
-                        "method": vision_result["method"],
-                        "quality_score": vision_result["metadata"].get("confidence", 0.8),
-                        "extracted_at": vision_result.get("extracted_at", datetime.utcnow().isoformat()),
-                        "metadata": vision_result.get("metadata", {})
-                    }
-
-                    # Track Vision AI cost
-                    try:
-                        cost_tracker = get_cost_tracking_service()
-                        cost_tracker.track_cost(
-                            db=db_session,
-                            service_type="vision_ai",
-                            model_name=vision_result["metadata"].get("model", "claude-vision"),
-                            cost_usd=vision_result["metadata"].get("cost_usd", 0),
-                            document_id=document_id,
-                            case_id=case_id,
-                            input_tokens=vision_result["metadata"].get("input_tokens"),
-                            output_tokens=vision_result["metadata"].get("output_tokens"),
-                            duration_ms=vision_result["metadata"].get("duration_ms"),
-                            success=True,
-                            extra_data={"pages_processed": vision_result["metadata"].get("pages_processed")}
-                        )
-                    except Exception as track_error:
-                        logger.error(f"Failed to track Vision AI cost: {str(track_error)}")
-                else:
-                    # Vision AI failed - mark as poor quality
-                    raise Exception(vision_result.get("error", "Vision AI extraction failed"))
-
-            except Exception as vision_error:
-                logger.warning(f"Vision AI fallback failed: {str(vision_error)}")
-
-                # Mark document as poor quality
-                document.status = "poor_quality"
-                document.document_metadata = {
-                    "extraction": extraction_result,
-                    "vision_fallback_attempted": True,
-                    "vision_fallback_error": str(vision_error),
-                    "processing": {
-                        "started_at": datetime.utcnow().isoformat(),
-                        "completed_at": datetime.utcnow().isoformat(),
-                        "error": "Text quality too low and Vision AI fallback failed"
-                    }
-                }
-
-                # Create failure event
-                event = Event(
-                    aggregate_type="document",
-                    aggregate_id=document_id,
-                    event_type="DocumentAnalysisFailed",
-                    event_data={
-                        "case_id": str(case_id),
-                        "error_type": "quality_too_low",
-                        "error_message": f"Quality score {extraction_result['quality_score']} below threshold, Vision AI failed"
-                    },
-                    event_metadata={"source": "ai_processing"}
-                )
-                db_session.add(event)
-                db_session.commit()
-                return
-
-        # 4. AI Analysis
-        started_at = datetime.utcnow()
-        analysis_result = await ai_service.process_document(
-            extraction_result["text"],
-            document.file_type
-        )
-        completed_at = datetime.utcnow()
-
-        # Track AI costs
-        try:
-            cost_tracker = get_cost_tracking_service()
-
-            # Track Claude analysis cost
-            if "analysis" in analysis_result and "cost_usd" in analysis_result["analysis"]:
-                cost_tracker.track_cost(
-                    db=db_session,
-                    service_type="text_analysis",
-                    model_name=analysis_result["analysis"].get("model", "claude"),
-                    cost_usd=analysis_result["analysis"]["cost_usd"],
-                    document_id=document_id,
-                    case_id=case_id,
-                    input_tokens=analysis_result["analysis"].get("tokens_used"),
-                    output_tokens=None,
-                    duration_ms=int((completed_at - started_at).total_seconds() * 1000),
-                    success=True
-                )
-
-            # Track GPT-4 entity extraction cost
-            if "entities" in analysis_result and "cost_usd" in analysis_result["entities"]:
-                cost_tracker.track_cost(
-                    db=db_session,
-                    service_type="entity_extraction",
-                    model_name=analysis_result["entities"].get("model", "gpt-4"),
-                    cost_usd=analysis_result["entities"]["cost_usd"],
-                    document_id=document_id,
-                    case_id=case_id,
-                    input_tokens=analysis_result["entities"].get("tokens_used"),
-                    output_tokens=None,
-                    success=True
-                )
-        except Exception as track_error:
-            logger.error(f"Failed to track AI costs: {str(track_error)}")
-
-        # 5. Store results
-        document.document_metadata = {
-            "extraction": {
-                "text": extraction_result["text"][:10000],  # Store first 10k chars
-                "text_length": extraction_result["text_length"],
-                "quality_score": extraction_result["quality_score"],
-                "extracted_at": extraction_result["extracted_at"],
-                "extraction_method": extraction_result["method"],
-                "metadata": extraction_result.get("metadata", {})
-            },
-            "analysis": analysis_result["analysis"],
-            "entities": analysis_result["entities"],
-            "processing": {
-                "started_at": started_at.isoformat(),
-                "completed_at": completed_at.isoformat(),
-                "duration_ms": int((completed_at - started_at).total_seconds() * 1000),
-                "total_cost_usd": analysis_result["total_cost"]
-            }
-        }
-        document.status = "analysis_complete"
-
-        # 6. Emit success event
-        event = Event(
-            aggregate_type="document",
-            aggregate_id=document_id,
-            event_type="DocumentAnalyzed",
-            event_data={
-                "case_id": str(case_id),
-                "classification": analysis_result["analysis"]["classification"],
-                "confidence": analysis_result["analysis"]["confidence"],
-                "total_cost_usd": analysis_result["total_cost"]
-            },
-            event_metadata={
-                "source": "ai_processing",
-                "models": analysis_result["model_versions"]
-            }
-        )
-        db_session.add(event)
-        db_session.commit()
-
-        logger.info(f"Document {document_id} analysis complete: {analysis_result['analysis']['classification']}")
-
-    except Exception as e:
-        logger.error(f"Document processing failed for {document_id}: {str(e)}")
-
-        # Update document status
-        try:
-            document = db_session.query(Document).filter(
-                Document.document_id == document_id
-            ).first()
-
-            if document:
-                document.status = "extraction_failed"
-                if not document.document_metadata:
-                    document.document_metadata = {}
-
-                document.document_metadata["processing"] = {
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                    "failed_at": datetime.utcnow().isoformat()
-                }
-
-                # Create failure event
-                event = Event(
-                    aggregate_type="document",
-                    aggregate_id=document_id,
-                    event_type="DocumentAnalysisFailed",
-                    event_data={
-                        "case_id": str(case_id),
-                        "error_type": type(e).__name__,
-                        "error_message": str(e)
-                    },
-                    event_metadata={"source": "ai_processing"}
-                )
-                db_session.add(event)
-                db_session.commit()
-        except Exception as db_error:
-            logger.error(f"Failed to update error status: {str(db_error)}")
-
-    finally:
-        # Clean up temp file
-        if tmp_path and os.path.exists(tmp_path):
-            try:
-                os.unlink(tmp_path)
-            except Exception as cleanup_error:
-                logger.warning(f"Failed to delete temp file {tmp_path}: {str(cleanup_error)}")
-
-
 @router.post("/{document_id}/analyze", response_model=DocumentAnalysisResponse, status_code=status.HTTP_202_ACCEPTED)
 async def analyze_document(
     case_id: UUID,
     document_id: UUID,
     request: AnalyzeDocumentRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Trigger AI analysis of a single document
@@ -601,39 +768,46 @@ async def analyze_document(
     Returns 202 Accepted immediately and processes in background.
     Use GET /{document_id}/analysis to poll for results.
     """
-    from app.domain.events import DocumentAnalysisStartedEvent
-
-    # Verify case exists
-    case = db.query(Case).filter(Case.case_id == case_id).first()
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Case with ID {case_id} not found"
-        )
-
     # Get document
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
+    document = await db.scalar(
+        select(Document).where(Document.document_id == document_id, Document.case_id == case_id)
+    )
 
     if not document:
+        await ensure_case_exists(db, case_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document with ID {document_id} not found in case {case_id}"
         )
 
     # Check if already processed
-    if document.document_metadata and document.document_metadata.get("analysis") and not request.force_reanalyze:
+    md = document.document_metadata or {}
+    if md.get("analysis") and not request.force_reanalyze:
         return DocumentAnalysisResponse(
             document_id=document_id,
             status=document.status,
-            extraction=document.document_metadata.get("extraction"),
-            analysis=document.document_metadata.get("analysis"),
-            entities=document.document_metadata.get("entities"),
-            processing=document.document_metadata.get("processing")
+            extraction=md.get("extraction"),
+            analysis=md.get("analysis"),
+            entities=md.get("entities"),
+            processing=md.get("processing")
         )
 
+    # Identical bytes were already analysed (in any case): copy the results
+    # instead of paying for another extraction and LLM run
+    if document.content_hash and not request.force_reanalyze:
+        source = (await db.execute(
+            select(Document.document_id, Document.document_metadata)
+            .where(
+                Document.content_hash == document.content_hash,
+                Document.document_id != document_id,
+                Document.status == "analysis_complete"
+            )
+            .order_by(Document.updated_at.desc())
+            .limit(1)
+        )).first()
+        if source:
+            return await _reuse_analysis(db, document_id, case_id, source)
+
     # Update status to processing
     document.status = "processing"
 
@@ -643,16 +817,16 @@ async def analyze_document(
         aggregate_id=document_id,
         event_type="DocumentAnalysisStarted",
         event_data={
-            "case_id": str(case_id),
+            "case_id": case_id,
             "triggered_by": "user"
         },
         event_metadata={"source": "api"}
     )
     db.add(event)
-    db.commit()
+    await db.commit()
 
-    # Schedule background processing
-    background_tasks.add_task(process_document_background, document_id, case_id, db)
+    # Hand off to the analysis worker pool
+    await enqueue_document_analysis(document_id, case_id)
 
     return DocumentAnalysisResponse(
         document_id=document_id,
@@ -664,21 +838,64 @@ async def analyze_document(
     )
 
 
+async def _reuse_analysis(db: AsyncSession, document_id: UUID, case_id: UUID, source) -> DocumentAnalysisResponse:
+    """Store another document's finished analysis (same content_hash) as this one's"""
+    source_md = source.document_metadata
+    now_iso = datetime.utcnow().isoformat()
+    results = {
+        "extraction": source_md.get("extraction"),
+        "analysis": source_md.get("analysis"),
+        "entities": source_md.get("entities"),
+        "processing": {
+            "started_at": now_iso,
+            "completed_at": now_iso,
+            "duration_ms": 0,
+            "total_cost_usd": 0.0,
+            "reused_from": str(source.document_id)
+        }
+    }
+    await db.execute(document_metadata_update(document_id, results, new_status="analysis_complete"))
+
+    db.add(Event(
+        aggregate_type="document",
+        aggregate_id=document_id,
+        event_type="DocumentAnalyzed",
+        event_data={
+            "case_id": case_id,
+            "classification": results["analysis"].get("classification"),
+            "confidence": results["analysis"].get("confidence"),
+            "total_cost_usd": 0.0,
+            "reused_from": source.document_id
+        },
+        event_metadata={"source": "content_hash_reuse"}
+    ))
+    await db.commit()
+
+    return DocumentAnalysisResponse(document_id=document_id, status="analysis_complete", **results)
+
+
 @router.get("/{document_id}/analysis", response_model=DocumentAnalysisResponse)
 async def get_analysis(
     case_id: UUID,
     document_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current analysis status and results
 
     Use this endpoint to poll for completion after triggering analysis.
+    Responses carry an ETag; send it back in If-None-Match to get a bodiless
+    304 while nothing has changed.
     """
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
+    # Status and timestamp first: an unchanged document never loads its metadata
+    document = (await db.execute(
+        select(Document.status, Document.updated_at).where(
+            Document.document_id == document_id,
+            Document.case_id == case_id
+        )
+    )).first()
 
     if not document:
         raise HTTPException(
@@ -686,13 +903,23 @@ async def get_analysis(
             detail=f"Document with ID {document_id} not found in case {case_id}"
         )
 
+    etag = f'"{document.status}:{document.updated_at.isoformat()}"'
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+    md = await db.scalar(
+        select(Document.document_metadata).where(Document.document_id == document_id)
+    ) or {}
     return DocumentAnalysisResponse(
         document_id=document_id,
         status=document.status,
-        extraction=document.document_metadata.get("extraction") if document.document_metadata else None,
-        analysis=document.document_metadata.get("analysis") if document.document_metadata else None,
-        entities=document.document_metadata.get("entities") if document.document_metadata else None,
-        processing=document.document_metadata.get("processing") if document.document_metadata else None
+        extraction=md.get("extraction"),
+        analysis=md.get("analysis"),
+        entities=md.get("entities"),
+        processing=md.get("processing")
     )
 
 
@@ -700,71 +927,61 @@ async def get_analysis(
 async def analyze_bulk(
     case_id: UUID,
     request: BulkAnalyzeRequest,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Analyze multiple documents in sequence
+    Analyze multiple documents
 
-    Processes documents one by one to manage rate limits.
-    Returns immediately with count of queued documents.
+    Documents are queued for the Celery analysis workers (on their own
+    queue), which bound how many run concurrently to respect AI
+    provider rate limits. Returns immediately with count of queued documents.
     """
-    # Verify case exists
-    case = db.query(Case).filter(Case.case_id == case_id).first()
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Case with ID {case_id} not found"
+    # Only ids and whether an analysis already exists; the (large) metadata
+    # blob stays in the database
+    rows = (await db.execute(
+        select(Document.document_id, Document.document_metadata.has_key("analysis").label("analyzed"))
+        .where(
+            Document.case_id == case_id,
+            document_id_in(request.document_ids)
         )
+    )).all()
 
-    # Get all requested documents
-    documents = db.query(Document).filter(
-        Document.case_id == case_id,
-        Document.document_id.in_(request.document_ids)
-    ).all()
-
-    if not documents:
+    if not rows:
+        await ensure_case_exists(db, case_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No documents found with provided IDs"
         )
 
     # Filter documents that need analysis
-    docs_to_analyze = []
-    already_analyzed = 0
-
-    for doc in documents:
-        if request.force_reanalyze or not (doc.document_metadata and doc.document_metadata.get("analysis")):
-            docs_to_analyze.append(doc)
-        else:
-            already_analyzed += 1
-
-    # Queue each document for processing
-    for doc in docs_to_analyze:
-        doc.status = "processing"
-
-        event = Event(
-            aggregate_type="document",
-            aggregate_id=doc.document_id,
-            event_type="DocumentAnalysisStarted",
-            event_data={
-                "case_id": str(case_id),
-                "triggered_by": "bulk"
-            },
-            event_metadata={"source": "api"}
+    ids_to_analyze = [row.document_id for row in rows if request.force_reanalyze or not row.analyzed]
+    already_analyzed = len(rows) - len(ids_to_analyze)
+
+    if ids_to_analyze:
+        # One UPDATE and one multi-row event INSERT for the whole batch
+        await db.execute(
+            update(Document)
+            .where(document_id_in(ids_to_analyze))
+            .values(status="processing")
+            .execution_options(synchronize_session=False)
         )
-        db.add(event)
 
-        # Add to background tasks
-        background_tasks.add_task(process_document_background, doc.document_id, case_id, db)
+        await Event.bulk_append(db, [
+            DocumentAnalysisStartedEvent.build(document_id, case_id, triggered_by="bulk")
+            for document_id in ids_to_analyze
+        ], {"source": "api"})
 
-    db.commit()
+        await db.commit()
+
+    # Queue after commit: workers read the documents with their own sessions
+    if ids_to_analyze:
+        await enqueue_bulk_analysis(ids_to_analyze, case_id)
 
     return {
         "total": len(request.document_ids),
-        "queued": len(docs_to_analyze),
+        "queued": len(ids_to_analyze),
         "already_analyzed": already_analyzed,
-        "message": f"Queued {len(docs_to_analyze)} documents for analysis"
+        "message": f"Queued {len(ids_to_analyze)} documents for analysis"
     }
 
 
@@ -772,62 +989,59 @@ async def analyze_bulk(
 async def estimate_cost(
     case_id: UUID,
     request: BulkAnalyzeRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Estimate cost before processing documents
 
     Calculates based on document file sizes and current daily budget.
     """
-    from app.services import get_ai_service
-
     ai_service = get_ai_service()
 
-    # Verify case exists
-    case = db.query(Case).filter(Case.case_id == case_id).first()
-    if not case:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Case with ID {case_id} not found"
-        )
+    # Rough estimate: PDF/DOCX ~500 chars per page, ~10 pages avg
+    # Images ~2000 chars per page
+    is_text_document = or_(Document.file_type.ilike('%pdf%'), Document.file_type.ilike('%word%'))
+    estimated_text_length = case(
+        (is_text_document, func.least(Document.file_size // 100, 50000)),  # Conservative estimate
+        else_=func.least(Document.file_size // 50, 20000)
+    )
+    # Already analyzed documents are skipped unless force reanalyze
+    needs_analysis = true() if request.force_reanalyze else (
+        Document.document_metadata.has_key("analysis").isnot(True)
+    )
 
-    # Get documents
-    documents = db.query(Document).filter(
-        Document.case_id == case_id,
-        Document.document_id.in_(request.document_ids)
-    ).all()
+    # One aggregate row; the per-document estimate is summed in the database
+    totals = (await db.execute(
+        select(
+            func.count().label("document_count"),
+            func.count().filter(needs_analysis).label("to_analyze"),
+            func.coalesce(func.sum(estimated_text_length).filter(needs_analysis), 0).label("text_length")
+        )
+        .where(
+            Document.case_id == case_id,
+            document_id_in(request.document_ids)
+        )
+    )).one()
 
-    if not documents:
+    document_count = totals.document_count
+    if not document_count:
+        await ensure_case_exists(db, case_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No documents found with provided IDs"
         )
 
-    # Estimate cost for each document
-    total_cost = 0.0
-    for doc in documents:
-        # Skip already analyzed unless force reanalyze
-        if not request.force_reanalyze and doc.document_metadata and doc.document_metadata.get("analysis"):
-            continue
-
-        # Rough estimate: PDF/DOCX ~500 chars per page, ~10 pages avg
-        # Images ~2000 chars per page
-        if 'pdf' in doc.file_type.lower() or 'word' in doc.file_type.lower():
-            estimated_text_length = min(doc.file_size // 100, 50000)  # Conservative estimate
-        else:
-            estimated_text_length = min(doc.file_size // 50, 20000)
+    total_cost = ai_service.estimate_batch_cost(int(totals.text_length), totals.to_analyze)
 
-        cost = ai_service.estimate_cost(estimated_text_length)
-        total_cost += cost
-
-    # Check budget
-    within_budget, remaining = ai_service.check_daily_budget()
+    # Check budget against what every worker has spent today
+    spent = float(await db.scalar(daily_spend_query()))
+    within_budget, remaining = ai_service.check_daily_budget(spent)
 
     # Estimate time (rough: 30 seconds per document)
-    estimated_time = len(documents) * 30
+    estimated_time = document_count * 30
 
     return AnalysisCostEstimate(
-        total_documents=len(documents),
+        total_documents=document_count,
         estimated_cost_usd=round(total_cost, 3),
         estimated_time_seconds=estimated_time,
         within_budget=total_cost <= remaining,
@@ -841,52 +1055,74 @@ async def estimate_cost(
 
 @router.get("/{document_id}/preview-url", response_model=DocumentPreviewUrl)
 async def get_preview_url(
-    case_id: UUID,
-    document_id: UUID,
-    db: Session = Depends(get_db),
-    s3_service: S3Service = Depends(get_s3_service)
+    request: Request,
+    response: Response,
+    document: Row = Depends(get_document_or_404),
+    s3_service: S3Service = Depends(get_s3_service),
+    cache: CacheService = Depends(get_cache_service)
 ):
     """
     Get a presigned URL for document preview
 
-    URL is valid for 1 hour. Use for PDF/image viewing in browser.
+    URL is valid until expires_at (up to 1 hour). Use for PDF/image viewing in browser.
+    The ETag changes whenever a new URL is signed; If-None-Match gets a 304
+    while the client's URL is still the one being handed out.
     """
-    from datetime import timedelta
-
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
-
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document with ID {document_id} not found in case {case_id}"
-        )
-
-    # Generate presigned URL (1 hour expiry)
-    url = s3_service.get_file_url(document.s3_key, expiration=3600)
-
-    if not url:
+    presigned = await run_in_threadpool(_presigned_preview_url, cache, s3_service, document.s3_key)
+    if not presigned:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to generate preview URL"
         )
 
+    url, expires_at = presigned
+    etag = f'"{expires_at:.6f}"'
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
     return DocumentPreviewUrl(
         url=url,
-        expires_at=datetime.utcnow() + timedelta(hours=1),
+        expires_at=datetime.utcfromtimestamp(expires_at),
         file_type=document.file_type,
         filename=document.original_filename
     )
 
 
+def _presigned_preview_url(cache: CacheService, s3_service: S3Service, s3_key: str) -> Optional[tuple[str, float]]:
+    """
+    Return (url, expires_at epoch seconds) for an object, signing on cache miss
+
+    URLs are shared through Redis across API workers, so repeat previews of
+    a document skip signing and keep a stable, browser-cacheable URL.
+    """
+    key = preview_url_cache_key(s3_key)
+    cached = cache.get(key)
+    if cached:
+        entry = orjson.loads(cached)
+        if entry["expires_at"] - time.time() > PREVIEW_URL_MIN_REMAINING:
+            return entry["url"], entry["expires_at"]
+
+    expires_at = time.time() + PREVIEW_URL_EXPIRY
+    url = s3_service.get_file_url(s3_key, expiration=PREVIEW_URL_EXPIRY)
+    if not url:
+        return None
+
+    cache.set(
+        key,
+        orjson.dumps({"url": url, "expires_at": expires_at}),
+        PREVIEW_URL_EXPIRY - PREVIEW_URL_MIN_REMAINING
+    )
+    return url, expires_at
+
+
 @router.patch("/{document_id}/analysis", response_model=DocumentAnalysisResponse)
 async def update_analysis(
     case_id: UUID,
     document_id: UUID,
     request: AnalysisUpdateRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update document analysis with user corrections
@@ -894,96 +1130,69 @@ async def update_analysis(
     Allows users to correct AI-extracted summary, classification,
     key points, and entities. Marks the document as user-edited.
     """
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
-
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document with ID {document_id} not found in case {case_id}"
-        )
+    metadata = Document.document_metadata
+    for section, patch in (
+        ("analysis", request.model_dump(include={"summary", "classification", "key_points"}, exclude_none=True)),
+        ("entities", request.entities.model_dump(exclude_none=True) if request.entities else {}),
+    ):
+        if patch:
+            # Merge into the section server-side; untouched fields keep their values.
+            # The section is read from the stored column (the sections are
+            # disjoint), not from the jsonb_set() built on the previous pass
+            metadata = func.jsonb_set(
+                metadata,
+                cast([section], ARRAY(String)),
+                func.coalesce(Document.document_metadata[section], cast({}, JSONB)).op("||")(cast(patch, JSONB)),
+                True,
+                type_=JSONB
+            )
+    metadata = metadata.op("||")(cast({"user_edited": True, "edited_at": datetime.utcnow().isoformat()}, JSONB))
 
-    if not document.document_metadata:
+    updated = update(Document).where(
+        Document.document_id == document_id,
+        Document.case_id == case_id,
+        Document.document_metadata.isnot(None)
+    ).values(document_metadata=metadata, updated_at=func.now()).returning(
+        Document.document_id,
+        Document.status,
+        Document.document_metadata["extraction"].label("extraction"),
+        Document.document_metadata["analysis"].label("analysis"),
+        Document.document_metadata["entities"].label("entities"),
+        Document.document_metadata["processing"].label("processing")
+    ).cte("updated")
+
+    # Update and audit event in one statement
+    event = audit_event_cte(
+        updated,
+        "DocumentAnalysisUpdated",
+        {"case_id": case_id, "updated_fields": list(request.model_dump(exclude_none=True))},
+        {"source": "user_correction"}
+    )
+    row = (await db.execute(
+        select(
+            updated.c.status, updated.c.extraction, updated.c.analysis,
+            updated.c.entities, updated.c.processing
+        ).add_cte(event)
+    )).one_or_none()
+
+    if row is None:
+        await db.rollback()
+        # Tell a missing document apart from one that was never analysed
+        await ensure_case_document(db, case_id, document_id)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No analysis data to update. Run analysis first."
         )
+    await db.commit()
 
-    # Deep copy metadata for update
-    metadata = dict(document.document_metadata)
-
-    # Update analysis fields
-    if request.summary is not None:
-        if "analysis" not in metadata:
-            metadata["analysis"] = {}
-        metadata["analysis"]["summary"] = request.summary
-
-    if request.classification is not None:
-        if "analysis" not in metadata:
-            metadata["analysis"] = {}
-        metadata["analysis"]["classification"] = request.classification
-
-    if request.key_points is not None:
-        if "analysis" not in metadata:
-            metadata["analysis"] = {}
-        metadata["analysis"]["key_points"] = request.key_points
-
-    # Update entities
-    if request.entities is not None:
-        if "entities" not in metadata:
-            metadata["entities"] = {}
-
-        if request.entities.people is not None:
-            metadata["entities"]["people"] = [
-                {"name": p.name, "role": p.role, "confidence": p.confidence}
-                for p in request.entities.people
-            ]
-
-        if request.entities.dates is not None:
-            metadata["entities"]["dates"] = request.entities.dates
-
-        if request.entities.locations is not None:
-            metadata["entities"]["locations"] = request.entities.locations
-
-        if request.entities.case_numbers is not None:
-            metadata["entities"]["case_numbers"] = request.entities.case_numbers
-
-        if request.entities.organizations is not None:
-            metadata["entities"]["organizations"] = request.entities.organizations
-
-    # Mark as user-edited
-    metadata["user_edited"] = True
-    metadata["edited_at"] = datetime.utcnow().isoformat()
-
-    # Save changes
-    document.document_metadata = metadata
-    document.updated_at = datetime.utcnow()
-
-    # Create audit event
-    updated_fields = [k for k, v in request.model_dump(exclude_none=True).items() if v is not None]
-    event = Event(
-        aggregate_type="document",
-        aggregate_id=document_id,
-        event_type="DocumentAnalysisUpdated",
-        event_data={
-            "case_id": str(case_id),
-            "updated_fields": updated_fields
-        },
-        event_metadata={"source": "user_correction"}
-    )
-    db.add(event)
-    db.commit()
-    db.refresh(document)
-
+    doc_status, extraction, analysis, entities, processing = row
     return DocumentAnalysisResponse(
         document_id=document_id,
-        status=document.status,
-        extraction=metadata.get("extraction"),
-        analysis=metadata.get("analysis"),
-        entities=metadata.get("entities"),
-        processing=metadata.get("processing")
+        status=doc_status,
+        extraction=extraction,
+        analysis=analysis,
+        entities=entities,
+        processing=processing
     )
 
 
@@ -992,72 +1201,49 @@ async def create_annotation(
     case_id: UUID,
     document_id: UUID,
     request: AnnotationCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Save a PDF annotation (highlight)
 
-    Annotations are stored in document_metadata.annotations array.
+    Each annotation is a row in document_annotations.
     """
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
+    annotation_id = uuid7()
+
+    # Selecting the document row doubles as the case/document check: no
+    # match inserts neither the annotation nor its audit event
+    added = insert(DocumentAnnotation).from_select(
+        ["annotation_id", "document_id", "page", "rects", "color", "text"],
+        select(
+            literal(annotation_id, PG_UUID(as_uuid=True)),
+            Document.document_id,
+            literal(request.page, Integer),
+            cast(request.model_dump(mode="json", include={"rects"})["rects"], JSONB),
+            literal(request.color, String),
+            literal(request.text, Text)
+        ).where(
+            Document.document_id == document_id,
+            Document.case_id == case_id
+        )
+    ).returning(DocumentAnnotation.document_id, DocumentAnnotation.created_at).cte("added")
 
-    if not document:
+    event = audit_event_cte(
+        added,
+        "DocumentAnnotationAdded",
+        {"case_id": case_id, "annotation_id": annotation_id, "page": request.page},
+        {"source": "user"}
+    )
+    created_at = (await db.execute(select(added.c.created_at).add_cte(event))).scalar_one_or_none()
+
+    if created_at is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Document with ID {document_id} not found in case {case_id}"
         )
-
-    # Initialize metadata if needed
-    if not document.document_metadata:
-        document.document_metadata = {}
-
-    metadata = dict(document.document_metadata)
-
-    # Initialize annotations array if needed
-    if "annotations" not in metadata:
-        metadata["annotations"] = []
-
-    # Create annotation
-    annotation_id = str(uuid.uuid4())
-    created_at = datetime.utcnow()
-
-    annotation = {
-        "id": annotation_id,
-        "page": request.page,
-        "rects": [rect.model_dump() for rect in request.rects],
-        "color": request.color,
-        "text": request.text,
-        "created_at": created_at.isoformat()
-    }
-
-    metadata["annotations"].append(annotation)
-    document.document_metadata = metadata
-    document.updated_at = datetime.utcnow()
-
-    # Required: SQLAlchemy doesn't auto-detect JSONB mutations
-    from sqlalchemy.orm.attributes import flag_modified
-    flag_modified(document, "document_metadata")
-
-    # Create audit event
-    event = Event(
-        aggregate_type="document",
-        aggregate_id=document_id,
-        event_type="DocumentAnnotationAdded",
-        event_data={
-            "case_id": str(case_id),
-            "annotation_id": annotation_id,
-            "page": request.page
-        },
-        event_metadata={"source": "user"}
-    )
-    db.add(event)
-    db.commit()
+    await db.commit()
 
     return AnnotationResponse(
-        id=annotation_id,
+        id=str(annotation_id),
         page=request.page,
         rects=request.rects,
         color=request.color,
@@ -1066,102 +1252,150 @@ async def create_annotation(
     )
 
 
+@router.post(
+    "/{document_id}/annotations/bulk",
+    response_model=list[AnnotationResponse],
+    status_code=status.HTTP_201_CREATED
+)
+async def create_annotations_bulk(
+    case_id: UUID,
+    document_id: UUID,
+    annotations: list[AnnotationCreate] = Body(..., min_length=1, max_length=MAX_BULK_ANNOTATIONS),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Save several PDF annotations at once
+
+    For bursts of highlights: all rows and their audit events are written
+    by one multi-row INSERT statement.
+    """
+    await ensure_case_document(db, case_id, document_id)
+
+    values = [
+        {"annotation_id": uuid7(), "document_id": document_id, **annotation}
+        for annotation in ANNOTATION_CREATE_LIST_ADAPTER.dump_python(annotations, mode="json")
+    ]
+    added = insert(DocumentAnnotation).values(values).returning(
+        DocumentAnnotation.annotation_id,
+        DocumentAnnotation.document_id,
+        DocumentAnnotation.page,
+        DocumentAnnotation.created_at
+    ).cte("added")
+
+    event = audit_event_cte(
+        added,
+        "DocumentAnnotationAdded",
+        # Typed arguments: json_build_object takes VARIADIC "any"
+        func.json_build_object(
+            literal_column("'case_id'"), cast(str(case_id), Text),
+            literal_column("'annotation_id'"), cast(added.c.annotation_id, Text),
+            literal_column("'page'"), added.c.page
+        ),
+        {"source": "user"}
+    )
+    # All rows share the transaction timestamp
+    created_at = (await db.execute(select(added.c.created_at).add_cte(event))).scalars().first()
+    await db.commit()
+
+    return ANNOTATION_LIST_ADAPTER.validate_python([
+        {
+            "id": str(row["annotation_id"]),
+            "page": row["page"],
+            "rects": row["rects"],
+            "color": row["color"],
+            "text": row["text"],
+            "created_at": created_at
+        }
+        for row in values
+    ])
+
+
 @router.get("/{document_id}/annotations", response_model=list[AnnotationResponse])
 async def get_annotations(
     case_id: UUID,
     document_id: UUID,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all annotations for a document
-    """
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
 
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document with ID {document_id} not found in case {case_id}"
+    Responses carry an ETag; send it back in If-None-Match to get a bodiless
+    304 while no annotation has been added or deleted.
+    """
+    annotations_of_document = (
+        select(DocumentAnnotation)
+        .join(Document, Document.document_id == DocumentAnnotation.document_id)
+        .where(
+            DocumentAnnotation.document_id == document_id,
+            Document.case_id == case_id
         )
+    )
 
-    if not document.document_metadata or "annotations" not in document.document_metadata:
+    # Count, newest timestamp and newest id change with every add/delete; the
+    # id also tells apart a delete and a create that share a batch timestamp
+    # (ids are UUIDv7, so their text form sorts by creation)
+    count, newest, newest_id = (await db.execute(
+        annotations_of_document.with_only_columns(
+            func.count(),
+            func.max(DocumentAnnotation.created_at),
+            func.max(cast(DocumentAnnotation.annotation_id, String))
+        )
+    )).one()
+    if not count:
+        # Empty list for an unannotated document, 404 for a missing one
+        await ensure_case_document(db, case_id, document_id)
+
+    etag = f'"{count}:{newest.isoformat() if newest else ""}:{newest_id or ""}"'
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+    if not count:
         return []
-
-    from app.api.schemas import AnnotationRect
-
-    annotations = []
-    for ann in document.document_metadata["annotations"]:
-        annotations.append(AnnotationResponse(
-            id=ann["id"],
-            page=ann["page"],
-            rects=[AnnotationRect(**rect) for rect in ann["rects"]],
-            color=ann["color"],
-            text=ann.get("text"),
-            created_at=datetime.fromisoformat(ann["created_at"])
-        ))
-
-    return annotations
+    # A bulk request gives all its rows one created_at; the id keeps them in
+    # insertion order
+    rows = (await db.execute(
+        annotations_of_document.with_only_columns(*ANNOTATION_COLUMNS)
+        .order_by(DocumentAnnotation.created_at, DocumentAnnotation.annotation_id)
+    )).mappings().all()
+    return ANNOTATION_LIST_ADAPTER.validate_python(rows)
 
 
 @router.delete("/{document_id}/annotations/{annotation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_annotation(
     case_id: UUID,
     document_id: UUID,
-    annotation_id: str,
-    db: Session = Depends(get_db)
+    annotation_id: UUID,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a specific annotation
     """
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
-
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document with ID {document_id} not found in case {case_id}"
+    deleted = delete(DocumentAnnotation).where(
+        DocumentAnnotation.annotation_id == annotation_id,
+        DocumentAnnotation.document_id == document_id,
+        exists().where(
+            Document.document_id == DocumentAnnotation.document_id,
+            Document.case_id == case_id
         )
-
-    if not document.document_metadata or "annotations" not in document.document_metadata:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="No annotations found"
-        )
-
-    metadata = dict(document.document_metadata)
-    original_count = len(metadata["annotations"])
-    metadata["annotations"] = [a for a in metadata["annotations"] if a["id"] != annotation_id]
-
-    if len(metadata["annotations"]) == original_count:
+    ).returning(DocumentAnnotation.document_id).cte("deleted")
+
+    # Delete and audit event in one statement
+    event = audit_event_cte(
+        deleted,
+        "DocumentAnnotationDeleted",
+        {"case_id": case_id, "annotation_id": annotation_id},
+        {"source": "user"}
+    )
+    if (await db.execute(select(deleted.c.document_id).add_cte(event))).first() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Annotation {annotation_id} not found"
         )
-
-    document.document_metadata = metadata
-    document.updated_at = datetime.utcnow()
-
-    # Required: SQLAlchemy doesn't auto-detect JSONB mutations
-    from sqlalchemy.orm.attributes import flag_modified
-    flag_modified(document, "document_metadata")
-
-    # Create audit event
-    event = Event(
-        aggregate_type="document",
-        aggregate_id=document_id,
-        event_type="DocumentAnnotationDeleted",
-        event_data={
-            "case_id": str(case_id),
-            "annotation_id": annotation_id
-        },
-        event_metadata={"source": "user"}
-    )
-    db.add(event)
-    db.commit()
+    await db.commit()
 
     return None
 
@@ -1170,7 +1404,7 @@ async def delete_annotation(
 async def export_docx(
     case_id: UUID,
     document_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Export document analysis as DOCX
@@ -1178,41 +1412,32 @@ async def export_docx(
     Generates a Word document with summary, classification,
     key points, and extracted entities.
     """
-    from fastapi.responses import StreamingResponse
-    from app.services.export_service import ExportService
-    import io
-
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
+    document = await get_case_document(db, case_id, document_id, *EXPORT_COLUMNS)
 
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document with ID {document_id} not found in case {case_id}"
-        )
-
-    if not document.document_metadata or not document.document_metadata.get("analysis"):
+    if not document.analysis:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No analysis data available. Run analysis first."
         )
 
-    export_service = ExportService()
-    docx_bytes = export_service.generate_docx(
+    # python-docx is CPU-bound: build the file off the event loop
+    buffer = io.BytesIO()
+    await run_in_threadpool(
+        ExportService().write_docx,
+        buffer,
         filename=document.original_filename,
-        analysis=document.document_metadata.get("analysis", {}),
-        entities=document.document_metadata.get("entities", {}),
-        extraction=document.document_metadata.get("extraction", {})
+        analysis=document.analysis,
+        entities=document.entities or {},
+        extraction=document.extraction or {}
     )
+    buffer.seek(0)
 
     # Create download filename
     base_name = Path(document.original_filename).stem
     download_name = f"{base_name}_analysis.docx"
 
     return StreamingResponse(
-        io.BytesIO(docx_bytes),
+        iter_buffer_chunks(buffer),
         media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         headers={"Content-Disposition": f'attachment; filename="{download_name}"'}
     )
@@ -1222,7 +1447,7 @@ async def export_docx(
 async def export_markdown(
     case_id: UUID,
     document_id: UUID,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Export document analysis as Markdown
@@ -1230,32 +1455,20 @@ async def export_markdown(
     Generates a markdown file with summary, classification,
     key points, and extracted entities.
     """
-    from fastapi.responses import Response
-    from app.services.export_service import ExportService
-
-    document = db.query(Document).filter(
-        Document.document_id == document_id,
-        Document.case_id == case_id
-    ).first()
-
-    if not document:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Document with ID {document_id} not found in case {case_id}"
-        )
+    document = await get_case_document(db, case_id, document_id, *EXPORT_COLUMNS)
 
-    if not document.document_metadata or not document.document_metadata.get("analysis"):
+    if not document.analysis:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No analysis data available. Run analysis first."
         )
 
-    export_service = ExportService()
-    markdown_content = export_service.generate_markdown(
+    markdown_content = await run_in_threadpool(
+        ExportService().generate_markdown,
         filename=document.original_filename,
-        analysis=document.document_metadata.get("analysis", {}),
-        entities=document.document_metadata.get("entities", {}),
-        extraction=document.document_metadata.get("extraction", {})
+        analysis=document.analysis,
+        entities=document.entities or {},
+        extraction=document.extraction or {}
     )
 
     # Create download filename
@@ -0,0 +1,44 @@
+"""Keyset pagination helpers
+
+List endpoints page on (created_at, id) instead of OFFSET so every page is an
+index range scan. The position is passed around as an opaque cursor string.
+"""
+import base64
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    """Encode the last row's sort key as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, row_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def set_next_cursor(response: Response, rows: list, limit: int, id_attr: str) -> None:
+    """Expose the cursor for the following page when this page is full"""
+    if rows and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, getattr(last, id_attr))
@@ -1,8 +1,11 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
 from datetime import datetime
 from uuid import UUID
 from typing import Optional
 
+MAX_BULK_DOCUMENTS = 500  # Upper bound on document_ids per bulk request
+MAX_BULK_ANNOTATIONS = 500  # Upper bound on annotations per bulk create
+
 
 class CaseCreate(BaseModel):
     """Schema for creating a new case"""
@@ -28,12 +31,11 @@ class CaseResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class DocumentResponse(BaseModel):
-    """Schema for document response
+class DocumentListItem(BaseModel):
+    """Schema for a document in list responses (no document_metadata)
 
     Status values:
     - uploaded: Successfully uploaded and stored (default)
@@ -57,12 +59,16 @@ class DocumentResponse(BaseModel):
     s3_key: str
     s3_bucket: str
     status: str
-    document_metadata: Optional[dict]
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class DocumentResponse(DocumentListItem):
+    """Schema for document response"""
+    document_metadata: Optional[dict]
+    content_hash: Optional[str] = None
 
 
 class DocumentUploadResponse(BaseModel):
@@ -71,6 +77,26 @@ class DocumentUploadResponse(BaseModel):
     message: str = "Document uploaded successfully"
 
 
+class DocumentPresignRequest(BaseModel):
+    """Schema for requesting a direct-to-storage upload URL"""
+    filename: str = Field(..., min_length=1, max_length=500)
+    file_size: int = Field(..., gt=0, description="Size in bytes of the file to be uploaded")
+
+
+class DocumentPresignResponse(BaseModel):
+    """Schema for a presigned direct upload"""
+    document_id: UUID = Field(..., description="ID to pass to the finalize endpoint")
+    upload_url: str = Field(..., description="S3 URL to POST the form to")
+    upload_fields: dict[str, str] = Field(..., description="Form fields to send before the file field")
+    content_type: str = Field(..., description="Content type of the upload")
+    expires_at: datetime = Field(..., description="URL expiration timestamp")
+
+
+class DocumentFinalizeRequest(BaseModel):
+    """Schema for registering a document uploaded via a presigned URL"""
+    filename: str = Field(..., min_length=1, max_length=500, description="Same filename as in the presign request")
+
+
 class DocumentAnalysisResponse(BaseModel):
     """Schema for document analysis results"""
     document_id: UUID
@@ -92,8 +118,7 @@ class DocumentAnalysisResponse(BaseModel):
         description="Processing metadata with timestamps and costs"
     )
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AnalyzeDocumentRequest(BaseModel):
@@ -105,16 +130,30 @@ class AnalyzeDocumentRequest(BaseModel):
 
 
 class BulkAnalyzeRequest(BaseModel):
-    """Schema for bulk document analysis"""
+    """
+    Schema for bulk document analysis
+
+    document_ids is de-duplicated and capped at MAX_BULK_DOCUMENTS. Load
+    the documents with one query over the whole list (document_id_in in
+    the documents API), never one query per id.
+    """
     document_ids: list[UUID] = Field(
         ...,
-        description="List of document IDs to analyze"
+        description=f"List of document IDs to analyze (at most {MAX_BULK_DOCUMENTS})"
     )
     force_reanalyze: bool = Field(
         default=False,
         description="Re-analyze documents even if already processed"
     )
 
+    @field_validator("document_ids")
+    @classmethod
+    def dedupe_document_ids(cls, document_ids: list[UUID]) -> list[UUID]:
+        unique_ids = list(dict.fromkeys(document_ids))
+        if len(unique_ids) > MAX_BULK_DOCUMENTS:
+            raise ValueError(f"At most {MAX_BULK_DOCUMENTS} documents per request")
+        return unique_ids
+
 
 class AnalysisCostEstimate(BaseModel):
     """Schema for cost estimation before processing"""
@@ -179,9 +218,16 @@ class AnnotationCreate(BaseModel):
 
 class AnnotationResponse(BaseModel):
     """Schema for annotation response"""
-    id: str = Field(..., description="Unique annotation ID")
+    id: str = Field(..., description="Unique annotation ID (time-ordered UUIDv7)")
     page: int
     rects: list[AnnotationRect]
     color: str
     text: Optional[str]
     created_at: datetime
+
+
+# Built once at import: list endpoints validate a whole page in one call
+CASE_LIST_ADAPTER = TypeAdapter(list[CaseResponse])
+DOCUMENT_LIST_ADAPTER = TypeAdapter(list[DocumentListItem])
+ANNOTATION_LIST_ADAPTER = TypeAdapter(list[AnnotationResponse])
+ANNOTATION_CREATE_LIST_ADAPTER = TypeAdapter(list[AnnotationCreate])
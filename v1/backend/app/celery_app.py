@@ -0,0 +1,75 @@
+"""Celery application for background document processing
+
+Start a worker with:
+    celery -A app.celery_app worker -Q analysis,analysis_bulk
+
+and exactly one beat with a worker for the maintenance queue:
+    celery -A app.celery_app worker -B -Q maintenance --concurrency=1
+"""
+import asyncio
+from uuid import UUID
+
+from celery import Celery
+from celery.signals import beat_init
+
+from app.config import settings
+from app.services.cost_tracking_service import run_cost_maintenance
+from app.services.document_pipeline import process_document_background
+
+# Single-document requests and bulk runs use separate queues, so a large
+# bulk batch cannot starve an analysis a user is waiting on
+ANALYSIS_QUEUE = "analysis"
+BULK_ANALYSIS_QUEUE = "analysis_bulk"
+# Periodic database upkeep, kept off the analysis workers
+MAINTENANCE_QUEUE = "maintenance"
+
+celery_app = Celery(
+    "case_analysis",
+    broker=settings.celery_broker_url,
+    backend=settings.celery_result_backend
+)
+
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_default_queue=ANALYSIS_QUEUE,
+    task_ignore_result=True,
+    # Analyses are long and rate limited by the AI providers: take one job
+    # at a time per process and acknowledge it only once it has finished
+    worker_concurrency=settings.analysis_concurrency,
+    worker_prefetch_multiplier=1,
+    task_acks_late=True,
+    beat_schedule={
+        "cost-maintenance": {
+            "task": "costs.maintenance",
+            "schedule": settings.cost_view_refresh_seconds,
+            # A run still waiting when the next one is due is dropped, so
+            # refreshes never pile up behind each other
+            "options": {"queue": MAINTENANCE_QUEUE, "expires": settings.cost_view_refresh_seconds},
+        },
+    },
+)
+
+
+@celery_app.task(name="documents.process", rate_limit=settings.analysis_rate_limit)
+def process_document_task(document_id: str, case_id: str) -> None:
+    """
+    Run the AI analysis pipeline for one document
+
+    The worker opens its own database session; only ids cross the broker.
+    """
+    asyncio.run(process_document_background(UUID(document_id), UUID(case_id)))
+
+
+@celery_app.task(name="costs.maintenance")
+def cost_maintenance_task() -> None:
+    """Provision cost partitions and refresh the cost rollup views"""
+    run_cost_maintenance()
+
+
+@beat_init.connect
+def run_cost_maintenance_at_startup(sender=None, **kwargs) -> None:
+    """Queue a maintenance run as soon as beat starts instead of one interval later"""
+    cost_maintenance_task.apply_async(
+        queue=MAINTENANCE_QUEUE, expires=settings.cost_view_refresh_seconds
+    )
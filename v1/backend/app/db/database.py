@@ -1,19 +1,118 @@
-from sqlalchemy import create_engine
+import uuid
+import orjson
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import get_settings
+from sqlalchemy.pool import NullPool
+from app.config import settings
+
+# Statement compilation cache, shared by all sessions on the engine; sized
+# above the default 500 so every distinct statement the API issues stays hot
+QUERY_CACHE_SIZE = 1200
+
+# Rows per multi-row INSERT ... VALUES when the ORM flushes many new
+# objects of one class (add_all, bulk cost/event rows)
+INSERTMANYVALUES_PAGE_SIZE = 1000
+
+# Prepared statements kept per asyncpg connection (SQLAlchemy's LRU, default
+# 100); every distinct statement the API issues should stay prepared
+ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE = 512
+
+
+# Short-lived processes (serverless) open a connection per checkout and
+# leave the pooling to PgBouncer; everything else keeps a warm pool
+POOL_OPTIONS = dict(poolclass=NullPool) if settings.db_null_pool else dict(
+    pool_pre_ping=True,
+    # Reuse the most recently returned connection: its prepared statements
+    # and server caches are warm, and surplus connections can idle out
+    pool_use_lifo=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+)
+
+# statement_timeout is sent as a startup parameter, which PgBouncer rejects;
+# behind it set the timeout on the role instead
+# (ALTER ROLE ... SET statement_timeout = '30s')
+STATEMENT_TIMEOUT = None if settings.db_pgbouncer else settings.db_statement_timeout
+
+PSYCOPG2_CONNECT_ARGS = {
+    "options": f"-c statement_timeout={STATEMENT_TIMEOUT}",
+} if STATEMENT_TIMEOUT else {}
+
+# Behind PgBouncer in transaction mode consecutive statements may run on
+# different server connections, so asyncpg must not keep named prepared
+# statements around (psycopg2 never prepares)
+ASYNCPG_CONNECT_ARGS = {
+    "statement_cache_size": 0,
+    "prepared_statement_cache_size": 0,
+    "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+} if settings.db_pgbouncer else {
+    "prepared_statement_cache_size": ASYNCPG_PREPARED_STATEMENT_CACHE_SIZE,
+}
+if STATEMENT_TIMEOUT:
+    ASYNCPG_CONNECT_ARGS["server_settings"] = {"statement_timeout": STATEMENT_TIMEOUT}
+
+
+def json_serializer(value) -> str:
+    """
+    Encode JSON/JSONB values with orjson's C encoder (drivers expect str)
+
+    UUIDs and datetimes are encoded natively, so payloads can hold them as is.
+    """
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
 
-settings = get_settings()
 
 engine = create_engine(
     settings.database_url,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
+    **POOL_OPTIONS,
+    connect_args=PSYCOPG2_CONNECT_ARGS,
+    # psycopg2 only: executemany UPDATE/DELETE also go out in pages
+    # (execute_batch), INSERTs as multi-row VALUES
+    executemany_mode="values_plus_batch",
+    insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
+    query_cache_size=QUERY_CACHE_SIZE,
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions of the analysis pipeline (status, results, events, cost rows).
+# Everything they write can be produced again by re-running the analysis, so
+# with db_pipeline_async_commit their commits return without waiting for the
+# WAL flush. A server crash can lose the last few hundred ms of those commits
+# (up to 3x wal_writer_delay); it cannot leave them half-applied.
+PipelineSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def _set_async_commit(session, transaction, connection):
+    """after_begin hook: asynchronous commit for this transaction only"""
+    # LOCAL ends with the transaction, so it never leaks to the next checkout
+    # (or, behind PgBouncer, to another client's transaction)
+    connection.exec_driver_sql("SET LOCAL synchronous_commit TO OFF")
+
+
+if settings.db_pipeline_async_commit:
+    event.listen(PipelineSessionLocal, "after_begin", _set_async_commit)
+
+# asyncpg engine for async request handlers; the sync engine above stays for
+# Alembic, background jobs and threadpool (plain def) endpoints
+async_engine = create_async_engine(
+    settings.database_url.replace("postgresql://", "postgresql+asyncpg://", 1),
+    **POOL_OPTIONS,
+    connect_args=ASYNCPG_CONNECT_ARGS,
+    insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
+    query_cache_size=QUERY_CACHE_SIZE,
+    json_serializer=json_serializer,
+    json_deserializer=orjson.loads
+)
+
+# expire_on_commit=False: attributes cannot be lazily reloaded under asyncio
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -24,3 +123,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency for FastAPI to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,66 @@
+"""Helpers for Alembic data migrations"""
+import logging
+import sqlalchemy as sa
+
+logger = logging.getLogger(__name__)
+
+
+def backfill_paginated(op, source: str, target: str, key: str = "id", page_size: int = 10000) -> int:
+    """
+    Copy every row of one table into another in separately committed batches
+
+    A single INSERT ... SELECT over a large table holds one huge transaction
+    (locks, WAL, bloat) and is lost entirely if it fails near the end. This
+    walks the source by `key` (keyset, not OFFSET, so each batch is an index
+    range scan) and commits after every page inside Alembic's autocommit
+    block. Columns are copied positionally, so target must have the same
+    column layout as source.
+
+    Note: autocommit_block commits the migration's transaction before it
+    starts; run schema changes the copy depends on before calling this.
+
+    Args:
+        op: The alembic.op module of the calling migration
+        source: Table to read from
+        target: Table to insert into
+        key: Unique, indexed column to page on
+        page_size: Rows per committed batch
+
+    Returns:
+        Number of rows copied
+    """
+    conn = op.get_bind()
+    first_page = sa.text(f"""
+        WITH batch AS (
+            SELECT * FROM {source} ORDER BY {key} LIMIT :page_size
+        ), inserted AS (
+            INSERT INTO {target} SELECT * FROM batch
+        )
+        SELECT (SELECT count(*) FROM batch) AS n,
+               (SELECT {key} FROM batch ORDER BY {key} DESC LIMIT 1) AS last_key
+    """)
+    next_page = sa.text(f"""
+        WITH batch AS (
+            SELECT * FROM {source} WHERE {key} > :last_key ORDER BY {key} LIMIT :page_size
+        ), inserted AS (
+            INSERT INTO {target} SELECT * FROM batch
+        )
+        SELECT (SELECT count(*) FROM batch) AS n,
+               (SELECT {key} FROM batch ORDER BY {key} DESC LIMIT 1) AS last_key
+    """)
+
+    copied = 0
+    last_key = None
+    with op.get_context().autocommit_block():
+        while True:
+            if last_key is None:
+                page = conn.execute(first_page, {"page_size": page_size}).one()
+            else:
+                page = conn.execute(next_page, {"last_key": last_key, "page_size": page_size}).one()
+            if not page.n:
+                break
+            copied += page.n
+            last_key = page.last_key
+            logger.info(f"Backfilled {copied} rows from {source} into {target}")
+
+    return copied
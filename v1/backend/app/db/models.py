@@ -1,43 +1,115 @@
-from sqlalchemy import Column, String, DateTime, BigInteger, Text, Integer, ForeignKey, Numeric, Boolean
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, DateTime, Date, BigInteger, Text, Integer, ForeignKey, Numeric, Boolean, Index, JSON, MetaData, Table, null, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB, insert as pg_insert
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-import uuid
+from typing import Optional
+from uuid6 import uuid7
 from app.db.database import Base
 
 
 class Event(Base):
-    """Event store - immutable log of all system events"""
+    """Event store - immutable log of all system events
+
+    Events commit with the read-model change they describe. Commits of the
+    analysis pipeline are asynchronous (see PipelineSessionLocal): after a
+    server crash its last events may be missing together with their status
+    and results, never one without the other.
+    """
     __tablename__ = "events"
 
-    event_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Generated by Postgres (also per row of multi-row INSERT ... SELECT) and
+    # read back with RETURNING when the ORM needs it
+    event_id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     aggregate_type = Column(String(50), nullable=False, index=True)  # 'case', 'document', etc.
     aggregate_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     event_type = Column(String(100), nullable=False)  # 'CaseCreated', 'DocumentUploaded', etc.
-    event_data = Column(JSONB, nullable=False)  # Event payload
+    event_data = Column(JSON, nullable=False)  # Event payload, write-only (JSON: stored as sent)
     event_metadata = Column(JSONB)  # user_id, timestamp, ai_model_version, etc.
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Typed copies of fixed-schema CaseCreated fields; event_data keeps the rest
+    event_data_title = Column(String(500), nullable=True)
+    event_data_case_number = Column(String(100), nullable=True)
+    # Partition key, so it is part of the primary key
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now(), index=True)
     sequence_number = Column(BigInteger, primary_key=True, autoincrement=True)
 
+    __table_args__ = (
+        Index('idx_events_aggregate_sequence', 'aggregate_type', 'aggregate_id', 'sequence_number'),
+        Index(
+            'idx_events_case_number', event_data_case_number,
+            postgresql_where=event_data_case_number.isnot(None)
+        ),
+        # Containment (@>) lookups only - query with event_metadata @> {...}
+        Index(
+            'idx_events_metadata_gin', event_metadata,
+            postgresql_using='gin', postgresql_ops={'event_metadata': 'jsonb_path_ops'}
+        ),
+        # Monthly partitions, see alembic revision 018
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+    @classmethod
+    def bulk_append(cls, session, events: list, default_metadata: Optional[dict] = None):
+        """
+        Append domain events (app.domain.events) with one multi-row INSERT
+
+        Works with either session kind: the result of session.execute() is
+        returned, so await it on an AsyncSession. Does not commit.
+
+        Args:
+            session: Session or AsyncSession
+            events: Non-empty list of BaseEvent instances
+            default_metadata: event_metadata for events that carry none
+        """
+        rows = []
+        for event in events:
+            # Class-level constants of each event type (ClassVar, not per instance)
+            event_cls = type(event)
+            event_data = dict(event.event_data)
+            title = case_number = None
+            if event_cls.event_type == "CaseCreated":
+                # Kept in typed columns, see revision 008
+                title = event_data.pop("title", None)
+                case_number = event_data.pop("case_number", None)
+            metadata = event.metadata if event.metadata is not None else default_metadata
+            rows.append({
+                "aggregate_type": event_cls.aggregate_type,
+                "aggregate_id": event.aggregate_id,
+                "event_type": event_cls.event_type,
+                "event_data": event_data,
+                "event_metadata": metadata if metadata is not None else null(),
+                "event_data_title": title,
+                "event_data_case_number": case_number,
+            })
+        return session.execute(pg_insert(cls).values(rows))
+
 
 class Case(Base):
     """Cases - read model"""
     __tablename__ = "cases"
 
-    case_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    case_id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     title = Column(String(500), nullable=False)
     case_number = Column(String(100), unique=True, nullable=False, index=True)
     status = Column(String(50), default="draft")  # draft, active, archived
-    case_metadata = Column(JSONB)  # Additional flexible data
+    case_metadata = Column(JSON)  # Additional flexible data, never queried server-side
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    # passive_deletes: the FK's ON DELETE SET NULL detaches cost records, so
+    # deleting a case never loads them
+    ai_cost_records = relationship("AICostTracking", back_populates="case", passive_deletes=True)
+
+    __table_args__ = (
+        Index('idx_cases_created_id', created_at.desc(), case_id.desc()),
+    )
+
 
 class Document(Base):
     """Documents - read model"""
     __tablename__ = "documents"
 
-    document_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    case_id = Column(UUID(as_uuid=True), ForeignKey("cases.case_id", ondelete="CASCADE"), nullable=False, index=True)
+    document_id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    case_id = Column(UUID(as_uuid=True), ForeignKey("cases.case_id", ondelete="CASCADE"), nullable=False)
     filename = Column(String(500), nullable=False)
     original_filename = Column(String(500), nullable=False)
     file_type = Column(String(100), nullable=False)
@@ -46,18 +118,57 @@ class Document(Base):
     s3_bucket = Column(String(255), nullable=False)
     status = Column(String(50), default="uploaded")  # uploaded, processing, failed
     document_metadata = Column(JSONB)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 hex of the uploaded bytes
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    ai_cost_records = relationship("AICostTracking", back_populates="document", passive_deletes=True)
+
+    __table_args__ = (
+        # Serves WHERE case_id = ? ORDER BY created_at DESC, document_id DESC
+        # (keyset pages in list_documents) without a sort
+        Index('idx_documents_case_created_id', 'case_id', created_at.desc(), document_id.desc()),
+        # Containment (@>) lookups only - query with document_metadata @> {...}
+        Index(
+            'idx_documents_metadata_gin', document_metadata,
+            postgresql_using='gin', postgresql_ops={'document_metadata': 'jsonb_path_ops'}
+        ),
+        # Finished analyses of identical content (see analyze_document)
+        Index('idx_documents_content_hash', content_hash, postgresql_where=content_hash.isnot(None)),
+        # Index-only lookups of one document in a case (see get_case_document)
+        Index(
+            'idx_documents_id_case_covering', document_id, case_id,
+            postgresql_include=['s3_key', 'file_type', 'original_filename']
+        ),
+    )
+
+
+class DocumentAnnotation(Base):
+    """PDF annotations (highlights) - one row per annotation"""
+    __tablename__ = "document_annotations"
+
+    # Time-ordered (UUIDv7) so new keys append to the right edge of the primary key index
+    annotation_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    document_id = Column(UUID(as_uuid=True), ForeignKey("documents.document_id", ondelete="CASCADE"), nullable=False)
+    page = Column(Integer, nullable=False)
+    rects = Column(JSONB, nullable=False)  # [{x, y, width, height}] in page percentages
+    color = Column(String(50), nullable=False)
+    text = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index('idx_document_annotations_document_created', 'document_id', 'created_at'),
+    )
+
 
 class AICostTracking(Base):
     """AI Cost Tracking - tracks all AI service usage and costs"""
     __tablename__ = "ai_cost_tracking"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     document_id = Column(UUID(as_uuid=True), ForeignKey("documents.document_id", ondelete="SET NULL"), nullable=True, index=True)
-    case_id = Column(UUID(as_uuid=True), ForeignKey("cases.case_id", ondelete="SET NULL"), nullable=True, index=True)
-    service_type = Column(String(50), nullable=False, index=True)  # 'text_analysis', 'entity_extraction', 'vision_ai'
+    case_id = Column(UUID(as_uuid=True), ForeignKey("cases.case_id", ondelete="SET NULL"), nullable=True)
+    service_type = Column(String(50), nullable=False)  # 'text_analysis', 'entity_extraction', 'vision_ai'
     model_name = Column(String(100), nullable=False)
     input_tokens = Column(Integer, nullable=True)
     output_tokens = Column(Integer, nullable=True)
@@ -66,4 +177,60 @@ class AICostTracking(Base):
     success = Column(Boolean, nullable=False, default=True)
     error_message = Column(Text, nullable=True)
     extra_data = Column(JSONB, nullable=True)  # Renamed from 'metadata' (reserved by SQLAlchemy)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    # Partition key, so it is part of the primary key
+    created_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
+
+    document = relationship("Document", back_populates="ai_cost_records")
+    case = relationship("Case", back_populates="ai_cost_records")
+
+    __table_args__ = (
+        Index('idx_ai_cost_tracking_service_created', 'service_type', created_at.desc()),
+        # Append-only time series: BRIN instead of B-Tree for range scans
+        Index(
+            'idx_ai_cost_tracking_created_at_brin', 'created_at',
+            postgresql_using='brin', postgresql_with={'pages_per_range': 32}
+        ),
+        # Ordered feed for get_recent_costs keyset pagination
+        Index('idx_ai_cost_tracking_created_id', created_at.desc(), id.desc()),
+        # Cost timeline of a case as an index-only scan; also serves plain case_id lookups
+        Index(
+            'idx_ai_cost_tracking_case_created', 'case_id', created_at.desc(),
+            postgresql_include=['cost_usd', 'service_type']
+        ),
+        # Containment (@>) lookups only - query with extra_data @> {...}
+        Index(
+            'idx_ai_cost_tracking_extra_data_gin', extra_data,
+            postgresql_using='gin', postgresql_ops={'extra_data': 'jsonb_path_ops'}
+        ),
+        # Monthly partitions, see alembic revision 007
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
+
+
+# Materialized views live in their own MetaData so Alembic autogenerate
+# does not try to create them as tables
+view_metadata = MetaData()
+
+# Daily cost rollup (refreshed periodically, see cost_tracking_service.run_cost_maintenance)
+ai_cost_daily = Table(
+    "mv_ai_cost_daily",
+    view_metadata,
+    Column("date", Date, primary_key=True),
+    Column("service_type", String(50), primary_key=True),
+    Column("model_name", String(100), primary_key=True),
+    Column("total_cost", Numeric),
+    Column("request_count", BigInteger),
+    Column("total_input_tokens", BigInteger),
+    Column("total_output_tokens", BigInteger),
+)
+
+# Spend per case and service (refreshed with the daily rollup)
+case_ai_cost_summary = Table(
+    "case_ai_cost_summary",
+    view_metadata,
+    Column("case_id", UUID(as_uuid=True), primary_key=True),
+    Column("service_type", String(50), primary_key=True),
+    Column("total_cost", Numeric),
+    Column("calls", BigInteger),
+    Column("last_call", DateTime(timezone=True)),
+)
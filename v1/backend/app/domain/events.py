@@ -1,26 +1,35 @@
 from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
-from typing import Optional, Any
+from typing import Any, ClassVar, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BaseEvent:
-    """Base class for all domain events"""
+    """Base class for all domain events
+
+    Immutable; subclasses with a fixed payload are created with build().
+    """
+    aggregate_type: ClassVar[str]  # events.aggregate_type: "case" or "document"
+    event_type: ClassVar[str]  # events.event_type, e.g. "DocumentUploaded"
+
     aggregate_id: UUID
-    event_type: str
     event_data: dict
     metadata: Optional[dict] = None
     created_at: Optional[datetime] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CaseCreatedEvent(BaseEvent):
     """Event emitted when a case is created"""
-    def __init__(self, case_id: UUID, title: str, case_number: str, metadata: Optional[dict] = None):
-        super().__init__(
+    aggregate_type = "case"
+    event_type = "CaseCreated"
+
+    @classmethod
+    def build(cls, case_id: UUID, title: str, case_number: str,
+              metadata: Optional[dict] = None) -> "CaseCreatedEvent":
+        return cls(
             aggregate_id=case_id,
-            event_type="CaseCreated",
             event_data={
                 "title": title,
                 "case_number": case_number,
@@ -29,28 +38,33 @@ class CaseCreatedEvent(BaseEvent):
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CaseUpdatedEvent(BaseEvent):
     """Event emitted when a case is updated"""
-    pass
+    aggregate_type = "case"
+    event_type = "CaseUpdated"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CaseDeletedEvent(BaseEvent):
     """Event emitted when a case is deleted"""
-    pass
+    aggregate_type = "case"
+    event_type = "CaseDeleted"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentUploadedEvent(BaseEvent):
     """Event emitted when a document is uploaded"""
-    def __init__(self, document_id: UUID, case_id: UUID, filename: str,
-                 file_type: str, file_size: int, s3_key: str, metadata: Optional[dict] = None):
-        super().__init__(
+    aggregate_type = "document"
+    event_type = "DocumentUploaded"
+
+    @classmethod
+    def build(cls, document_id: UUID, case_id: UUID, filename: str, file_type: str,
+              file_size: int, s3_key: str, metadata: Optional[dict] = None) -> "DocumentUploadedEvent":
+        return cls(
             aggregate_id=document_id,
-            event_type="DocumentUploaded",
             event_data={
-                "case_id": str(case_id),
+                "case_id": case_id,
                 "filename": filename,
                 "file_type": file_type,
                 "file_size": file_size,
@@ -60,44 +74,53 @@ class DocumentUploadedEvent(BaseEvent):
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentDeletedEvent(BaseEvent):
     """Event emitted when a document is deleted"""
-    def __init__(self, document_id: UUID, case_id: UUID, s3_key: str):
-        super().__init__(
+    aggregate_type = "document"
+    event_type = "DocumentDeleted"
+
+    @classmethod
+    def build(cls, document_id: UUID, case_id: UUID, s3_key: str) -> "DocumentDeletedEvent":
+        return cls(
             aggregate_id=document_id,
-            event_type="DocumentDeleted",
             event_data={
-                "case_id": str(case_id),
+                "case_id": case_id,
                 "s3_key": s3_key
             }
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentAnalysisStartedEvent(BaseEvent):
     """Event emitted when document AI analysis begins"""
-    def __init__(self, document_id: UUID, case_id: UUID, triggered_by: str):
-        super().__init__(
+    aggregate_type = "document"
+    event_type = "DocumentAnalysisStarted"
+
+    @classmethod
+    def build(cls, document_id: UUID, case_id: UUID, triggered_by: str) -> "DocumentAnalysisStartedEvent":
+        return cls(
             aggregate_id=document_id,
-            event_type="DocumentAnalysisStarted",
             event_data={
-                "case_id": str(case_id),
+                "case_id": case_id,
                 "triggered_by": triggered_by  # "user" or "bulk"
             }
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentTextExtractedEvent(BaseEvent):
     """Event emitted after text extraction completes"""
-    def __init__(self, document_id: UUID, case_id: UUID,
-                 text_length: int, quality_score: float, method: str):
-        super().__init__(
+    aggregate_type = "document"
+    event_type = "DocumentTextExtracted"
+
+    @classmethod
+    def build(cls, document_id: UUID, case_id: UUID,
+              text_length: int, quality_score: float, method: str) -> "DocumentTextExtractedEvent":
+        return cls(
             aggregate_id=document_id,
-            event_type="DocumentTextExtracted",
             event_data={
-                "case_id": str(case_id),
+                "case_id": case_id,
                 "text_length": text_length,
                 "quality_score": quality_score,
                 "extraction_method": method
@@ -105,23 +128,26 @@ class DocumentTextExtractedEvent(BaseEvent):
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentAnalyzedEvent(BaseEvent):
     """Event emitted after successful AI analysis"""
-    def __init__(self, document_id: UUID, case_id: UUID,
-                 classification: str, confidence: float,
-                 total_cost: float, model_versions: dict):
-        super().__init__(
+    aggregate_type = "document"
+    event_type = "DocumentAnalyzed"
+
+    @classmethod
+    def build(cls, document_id: UUID, case_id: UUID,
+              classification: str, confidence: float,
+              total_cost: float, model_versions: dict) -> "DocumentAnalyzedEvent":
+        return cls(
             aggregate_id=document_id,
-            event_type="DocumentAnalyzed",
             event_data={
-                "case_id": str(case_id),
+                "case_id": case_id,
                 "classification": classification,
                 "confidence": confidence,
                 "total_cost_usd": total_cost
             },
             metadata={
-                "source": "ai_service",
+                "source": "ai_processing",  # Same as the other pipeline events
                 "models": model_versions,
                 "cost_breakdown": {
                     "claude": model_versions.get("claude_cost", 0),
@@ -131,16 +157,19 @@ class DocumentAnalyzedEvent(BaseEvent):
         )
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DocumentAnalysisFailedEvent(BaseEvent):
     """Event emitted when AI analysis fails"""
-    def __init__(self, document_id: UUID, case_id: UUID,
-                 error_type: str, error_message: str):
-        super().__init__(
+    aggregate_type = "document"
+    event_type = "DocumentAnalysisFailed"
+
+    @classmethod
+    def build(cls, document_id: UUID, case_id: UUID,
+              error_type: str, error_message: str) -> "DocumentAnalysisFailedEvent":
+        return cls(
             aggregate_id=document_id,
-            event_type="DocumentAnalysisFailed",
             event_data={
-                "case_id": str(case_id),
+                "case_id": case_id,
                 "error_type": error_type,  # "extraction_failed", "api_error", "quality_too_low"
                 "error_message": error_message
             }
@@ -0,0 +1,4 @@
+"""Domain-facing aliases of the ORM models (defined once in app.db.models)"""
+from app.db.models import AICostTracking
+
+__all__ = ["AICostTracking"]
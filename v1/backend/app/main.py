@@ -1,14 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import get_settings
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from app.config import settings
 from app.api import cases, documents, admin
-
-settings = get_settings()
+from app.api.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
 
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    description="Legal case analysis system with AI-powered document processing"
+    description="Legal case analysis system with AI-powered document processing",
+    # orjson's C encoder for every JSON response (analysis polls return large payloads)
+    default_response_class=ORJSONResponse
 )
 
 # CORS middleware
@@ -18,8 +21,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
+# Compress responses for clients that accept gzip (analysis JSON, annotation
+# lists, Markdown exports); tiny bodies are not worth the overhead
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Include routers
 app.include_router(cases.router, prefix="/api/v1/cases", tags=["cases"])
 app.include_router(
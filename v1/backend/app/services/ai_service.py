@@ -26,11 +26,15 @@ except ImportError:
     OpenAIAPIError = Exception
     OpenAIRateLimitError = Exception
 
-from app.config import get_settings
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
 
+class DailyBudgetExceededError(Exception):
+    """Raised instead of starting an analysis once today's AI budget is spent"""
+
+
 class AIService:
     """Service for AI-powered document analysis"""
 
@@ -46,7 +50,6 @@ class AIService:
 
     def __init__(self):
         """Initialize AI service with API clients"""
-        settings = get_settings()
 
         # Initialize Anthropic client (REQUIRED)
         if not Anthropic:
@@ -79,24 +82,6 @@ class AIService:
         self.max_retries = getattr(settings, 'ai_max_retries', 3)
         self.daily_budget_usd = getattr(settings, 'ai_daily_budget_usd', 100.0)
 
-        # Cost tracking (in-memory, for production use Redis or database)
-        self._daily_costs = {}
-        self._last_reset = datetime.utcnow().date()
-
-    def _reset_daily_costs_if_needed(self):
-        """Reset daily costs if it's a new day"""
-        today = datetime.utcnow().date()
-        if today > self._last_reset:
-            self._daily_costs = {}
-            self._last_reset = today
-            logger.info("Daily AI costs reset")
-
-    def _track_cost(self, cost_usd: float):
-        """Track API cost"""
-        self._reset_daily_costs_if_needed()
-        today = datetime.utcnow().date().isoformat()
-        self._daily_costs[today] = self._daily_costs.get(today, 0.0) + cost_usd
-
     def _calculate_cost(
         self,
         input_tokens: int,
@@ -226,8 +211,6 @@ Please respond in the following JSON format:
                 self.CLAUDE_OUTPUT_PRICE
             )
 
-            self._track_cost(cost)
-
             logger.info(f"Claude analysis complete: {input_tokens} input, {output_tokens} output tokens, ${cost:.4f}")
 
             return {
@@ -317,8 +300,6 @@ Return ONLY a valid JSON object with no additional text."""
                 self.GPT4_OUTPUT_PRICE
             )
 
-            self._track_cost(cost)
-
             logger.info(f"GPT-4 entity extraction complete: {input_tokens} input, {output_tokens} output tokens, ${cost:.4f}")
 
             return {
@@ -480,54 +461,74 @@ Return ONLY a valid JSON object with no additional text."""
         Args:
             text_length: Number of characters in text
 
+        Returns:
+            Estimated cost in USD
+        """
+        return self.estimate_batch_cost(text_length, 1)
+
+    def estimate_batch_cost(self, total_text_length: int, document_count: int) -> float:
+        """
+        Estimate processing cost for a batch of documents
+
+        Input cost is linear in text length, so the batch only needs the
+        summed length; output tokens are charged once per document.
+
+        Args:
+            total_text_length: Number of characters across all documents
+            document_count: Number of documents in the batch
+
         Returns:
             Estimated cost in USD
         """
         # Rough estimate: ~4 chars per token
-        estimated_tokens = text_length // 4
+        estimated_tokens = total_text_length // 4
 
-        # Claude: input tokens + ~500 output tokens
+        # Claude: input tokens + ~500 output tokens per document
         claude_cost = self._calculate_cost(
             estimated_tokens,
-            500,
+            500 * document_count,
             self.CLAUDE_INPUT_PRICE,
             self.CLAUDE_OUTPUT_PRICE
         )
 
-        # GPT-4: input tokens + ~300 output tokens
+        # GPT-4: input tokens + ~300 output tokens per document
         gpt4_cost = self._calculate_cost(
             estimated_tokens,
-            300,
+            300 * document_count,
             self.GPT4_INPUT_PRICE,
             self.GPT4_OUTPUT_PRICE
         )
 
         return round(claude_cost + gpt4_cost, 5)
 
-    def check_daily_budget(self) -> Tuple[bool, float]:
+    def check_daily_budget(self, spent: float) -> Tuple[bool, float]:
         """
         Check if within daily budget
 
+        Spend is shared by every API and worker process, so it is read from
+        ai_cost_tracking by the caller (CostTrackingService.get_daily_spend).
+
+        Args:
+            spent: Today's (UTC) AI spend in USD
+
         Returns:
             (within_budget, remaining_budget_usd)
         """
-        self._reset_daily_costs_if_needed()
-        today = datetime.utcnow().date().isoformat()
-        spent = self._daily_costs.get(today, 0.0)
         remaining = self.daily_budget_usd - spent
 
         return remaining > 0, round(remaining, 2)
 
-    def get_daily_usage(self) -> dict:
+    def get_daily_usage(self, spent: float) -> dict:
         """
         Get current daily usage statistics
 
+        Args:
+            spent: Today's (UTC) AI spend in USD, as for check_daily_budget
+
         Returns:
             dict with spent, budget, remaining, percentage
         """
-        self._reset_daily_costs_if_needed()
         today = datetime.utcnow().date().isoformat()
-        spent = self._daily_costs.get(today, 0.0)
         remaining = max(0, self.daily_budget_usd - spent)
         percentage = (spent / self.daily_budget_usd * 100) if self.daily_budget_usd > 0 else 0
 
@@ -0,0 +1,25 @@
+"""Hand document analyses to the Celery worker pool"""
+import asyncio
+from uuid import UUID
+
+from app.celery_app import ANALYSIS_QUEUE, BULK_ANALYSIS_QUEUE, process_document_task
+
+
+def _publish(document_ids: list[UUID], case_id: UUID, queue: str) -> None:
+    for document_id in document_ids:
+        process_document_task.apply_async(args=(str(document_id), str(case_id)), queue=queue)
+
+
+async def enqueue_document_analysis(document_id: UUID, case_id: UUID) -> None:
+    """
+    Queue a document for background AI analysis
+
+    The document's "processing" status must be committed before calling,
+    since the worker reads it through its own session.
+    """
+    await asyncio.to_thread(_publish, [document_id], case_id, ANALYSIS_QUEUE)
+
+
+async def enqueue_bulk_analysis(document_ids: list[UUID], case_id: UUID) -> None:
+    """Queue a batch of documents on the bulk queue (same rules as above)"""
+    await asyncio.to_thread(_publish, document_ids, case_id, BULK_ANALYSIS_QUEUE)
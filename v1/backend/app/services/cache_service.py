@@ -0,0 +1,58 @@
+"""Redis cache for expensive, poll-heavy read endpoints"""
+import redis
+from typing import Optional
+import logging
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheService:
+    """
+    Short-lived cache of serialized responses
+
+    Redis errors are logged and treated as a miss, so an unavailable cache
+    only costs the uncached query.
+    """
+
+    def __init__(self):
+        self.client = redis.Redis.from_url(
+            settings.redis_url,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+            # PING idle pooled connections before reuse instead of failing on a dead one
+            health_check_interval=30
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached value or None on miss/error"""
+        try:
+            return self.client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache read failed for {key}: {e}")
+            return None
+
+    def set(self, key: str, value: bytes, ttl_seconds: int) -> None:
+        """Store a value that expires after ttl_seconds"""
+        try:
+            self.client.set(key, value, ex=ttl_seconds)
+        except redis.RedisError as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+
+    def delete(self, key: str) -> None:
+        """Invalidate a cached value"""
+        try:
+            self.client.delete(key)
+        except redis.RedisError as e:
+            logger.warning(f"Cache delete failed for {key}: {e}")
+
+
+# Singleton instance
+_cache_service = None
+
+def get_cache_service() -> CacheService:
+    """Get or create cache service instance"""
+    global _cache_service
+    if _cache_service is None:
+        _cache_service = CacheService()
+    return _cache_service
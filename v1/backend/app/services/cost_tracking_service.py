@@ -1,14 +1,35 @@
 """Cost tracking service for monitoring AI usage"""
 import logging
+from functools import partial
 from uuid import UUID
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from sqlalchemy import func, select, text
 from sqlalchemy.orm import Session
 
+from app.db.database import SessionLocal
 from app.db.models import AICostTracking
 
 logger = logging.getLogger(__name__)
 
+# Range-partitioned by created_at, one partition per month (revisions 007, 018)
+MONTHLY_PARTITIONED_TABLES = ("ai_cost_tracking", "events")
+# Cost rollup materialized views (revisions 004, 016)
+COST_VIEWS = ("mv_ai_cost_daily", "case_ai_cost_summary")
+
+
+def daily_spend_query():
+    """
+    SELECT today's (UTC) total AI spend from ai_cost_tracking
+
+    A range on created_at: only the current partition is read, through its
+    BRIN index.
+    """
+    day_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    return select(func.coalesce(func.sum(AICostTracking.cost_usd), 0)).where(
+        AICostTracking.created_at >= day_start
+    )
+
 
 class CostTrackingService:
     """Service for tracking AI costs in database"""
@@ -26,7 +47,8 @@ class CostTrackingService:
         duration_ms: Optional[int] = None,
         success: bool = True,
         error_message: Optional[str] = None,
-        extra_data: Optional[dict] = None
+        extra_data: Optional[dict] = None,
+        commit: bool = True
     ) -> AICostTracking:
         """
         Track AI service cost in database
@@ -44,6 +66,8 @@ class CostTrackingService:
             success: Whether the operation succeeded
             error_message: Error message if failed
             extra_data: Additional metadata
+            commit: Commit right away; pass False to only add the record to
+                    the session and let the caller's next commit write it
 
         Returns:
             AICostTracking record
@@ -63,8 +87,9 @@ class CostTrackingService:
                 extra_data=extra_data
             )
             db.add(record)
-            db.commit()
-            db.refresh(record)
+            if commit:
+                db.commit()
+                db.refresh(record)
 
             logger.info(
                 f"Tracked cost: {service_type} | {model_name} | "
@@ -78,6 +103,56 @@ class CostTrackingService:
             db.rollback()
             raise
 
+    @staticmethod
+    def get_daily_spend(db: Session) -> float:
+        """
+        Today's (UTC) AI spend in USD across all processes
+
+        Args:
+            db: Database session
+        """
+        return float(db.scalar(daily_spend_query()))
+
+    @staticmethod
+    def refresh_cost_view(db: Session, view: str) -> None:
+        """
+        Refresh one cost rollup materialized view (see COST_VIEWS)
+
+        Uses CONCURRENTLY so dashboard reads are not blocked during refresh.
+
+        Args:
+            db: Database session
+            view: Name of the materialized view
+        """
+        db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+        db.commit()
+
+    @staticmethod
+    def ensure_cost_partitions(db: Session, months_ahead: int = 2) -> None:
+        """
+        Create upcoming monthly partitions of ai_cost_tracking and events
+
+        Partitions are created ahead of time so new rows never land in the
+        default partition. Safe to call repeatedly.
+
+        Args:
+            db: Database session
+            months_ahead: How many months past the current one to provision
+        """
+        db.execute(
+            text("""
+                SELECT create_monthly_partition(parent, month::date)
+                FROM unnest(CAST(:parents AS text[])) AS parent
+                CROSS JOIN generate_series(
+                    date_trunc('month', now()),
+                    date_trunc('month', now()) + make_interval(months => :months_ahead),
+                    interval '1 month'
+                ) AS month
+            """),
+            {"parents": list(MONTHLY_PARTITIONED_TABLES), "months_ahead": months_ahead}
+        )
+        db.commit()
+
 
 # Singleton instance
 _cost_tracking_service: Optional[CostTrackingService] = None
@@ -89,3 +164,26 @@ def get_cost_tracking_service() -> CostTrackingService:
     if _cost_tracking_service is None:
         _cost_tracking_service = CostTrackingService()
     return _cost_tracking_service
+
+
+def run_cost_maintenance() -> None:
+    """
+    Provision cost partitions, then refresh each cost view
+
+    Run by the Celery beat schedule (app.celery_app), so one process does it
+    for the whole deployment. Every step has its own session and
+    transaction: a failing step is logged and does not skip the others.
+    """
+    steps = [("partition provisioning", CostTrackingService.ensure_cost_partitions)]
+    steps += [
+        (f"refresh of {view}", partial(CostTrackingService.refresh_cost_view, view=view))
+        for view in COST_VIEWS
+    ]
+    for name, step in steps:
+        db = SessionLocal()
+        try:
+            step(db)
+        except Exception as e:
+            logger.error(f"Cost maintenance {name} failed: {str(e)}")
+        finally:
+            db.close()
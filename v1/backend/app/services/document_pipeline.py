@@ -0,0 +1,362 @@
+"""AI analysis pipeline for one document, run by the Celery workers"""
+import asyncio
+import io
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import cast, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db.database import PipelineSessionLocal
+from app.db.models import Document, Event
+from app.domain.events import DocumentAnalysisFailedEvent, DocumentAnalyzedEvent, DocumentTextExtractedEvent
+from app.services.ai_service import DailyBudgetExceededError, get_ai_service
+from app.services.cost_tracking_service import get_cost_tracking_service
+from app.services.s3_service import get_s3_service
+from app.services.text_extraction_service import TEXT_PREVIEW_LENGTH, get_text_extraction_service
+from app.services.vision_ai_service import get_vision_ai_service
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_EVENT_METADATA = {"source": "ai_processing"}  # For analysis pipeline events without their own
+# Keep downloaded files in RAM (tmpfs) when available; None uses the system temp dir
+ANALYSIS_TMP_DIR = settings.analysis_tmp_dir if os.path.isdir(settings.analysis_tmp_dir) else None
+
+
+def document_metadata_update(document_id: UUID, patch: dict, new_status: Optional[str] = None):
+    """
+    UPDATE setting top-level document_metadata keys server-side
+
+    SET document_metadata = document_metadata || patch, so only the changed
+    keys are serialized and sent, and keys written elsewhere (e.g. the
+    upload checksum) are kept. Execute it on either session kind.
+    """
+    values = {
+        "document_metadata": func.coalesce(
+            Document.document_metadata, cast({}, JSONB)
+        ).op("||")(cast(patch, JSONB))
+    }
+    if new_status is not None:
+        values["status"] = new_status
+
+    return (
+        update(Document)
+        .where(Document.document_id == document_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def merge_document_metadata(
+    db: Session,
+    document_id: UUID,
+    patch: dict,
+    new_status: Optional[str] = None
+) -> bool:
+    """
+    Run document_metadata_update on a sync session. Does not commit.
+
+    Returns:
+        True if the document exists
+    """
+    return db.execute(document_metadata_update(document_id, patch, new_status)).rowcount > 0
+
+
+async def process_document_background(document_id: UUID, case_id: UUID):
+    """
+    Background task for document AI processing
+
+    Runs in a Celery worker (app.celery_app) on its own session. Events and
+    cost records stay pending and are written with the outcome (success,
+    poor quality or failure) in a single commit; no transaction is open
+    during the download or AI calls.
+
+    Steps:
+    1. Download document from S3 into memory
+    2. Extract text from the in-memory copy
+    3. Quality check
+    4. AI analysis (Claude + GPT-4)
+    5. Store results in document_metadata
+    6. Emit events at each stage
+    """
+    s3_service = get_s3_service()
+    text_service = get_text_extraction_service()
+    ai_service = get_ai_service()
+
+    db_session = PipelineSessionLocal()
+    tmp_path = None
+    # Domain events of this run, appended in one INSERT with the outcome
+    pending_events = []
+    # Wall-clock start for the stored timestamps; durations use the monotonic clock
+    started_iso = datetime.utcnow().isoformat()
+    started_ns = time.monotonic_ns()
+
+    try:
+        # Get document (only what the job needs)
+        document = db_session.execute(
+            select(Document.s3_key, Document.file_type, Document.filename)
+            .where(Document.document_id == document_id)
+        ).first()
+
+        if not document:
+            logger.error(f"Document {document_id} not found")
+            return
+
+        # The budget is shared by all workers: check what has been recorded
+        # today before spending more
+        spent = get_cost_tracking_service().get_daily_spend(db_session)
+        within_budget, _ = ai_service.check_daily_budget(spent)
+        if not within_budget:
+            raise DailyBudgetExceededError(
+                f"Daily AI budget of ${ai_service.daily_budget_usd:.2f} is spent (${spent:.2f} today)"
+            )
+
+        # End the read transaction: the connection goes back to the pool
+        # instead of idling through the download and AI calls
+        db_session.commit()
+
+        # 1. Download from S3 into memory: ranged parallel GET (TRANSFER_CONFIG),
+        # off the event loop. Files are at most MAX_FILE_SIZE.
+        file_buffer = io.BytesIO()
+        download_success = await asyncio.to_thread(s3_service.download_fileobj, document.s3_key, file_buffer)
+        if not download_success:
+            raise Exception("Failed to download file from S3")
+        file_buffer.seek(0)
+
+        # 2. Extract text straight from the buffer, no temp file
+        extraction_result = text_service.extract_text_from_stream(
+            file_buffer, document.file_type, document.filename
+        )
+
+        pending_events.append(DocumentTextExtractedEvent.build(
+            document_id, case_id,
+            text_length=extraction_result["text_length"],
+            quality_score=extraction_result["quality_score"],
+            method=extraction_result["method"]
+        ))
+
+        # 3. Quality check and Vision AI fallback
+        if extraction_result.get("needs_vision_fallback", False):
+            logger.info(
+                f"Poor text quality ({extraction_result['quality_score']}), "
+                f"attempting Vision AI fallback for document {document_id}"
+            )
+
+            try:
+                # Vision AI renders pages from a file path: spill the buffer
+                # to a temp file (tmpfs) only on this rare path
+                with tempfile.NamedTemporaryFile(
+                    delete=False, suffix=Path(document.filename).suffix, dir=ANALYSIS_TMP_DIR
+                ) as tmp:
+                    tmp_path = tmp.name
+                    tmp.write(file_buffer.getbuffer())
+
+                vision_service = get_vision_ai_service()
+                vision_result = vision_service.analyze_document(
+                    tmp_path,
+                    document_type="legal"
+                )
+
+                if vision_result.get("success") and vision_result.get("text"):
+                    # Vision AI succeeded - use its results
+                    logger.info(
+                        f"Vision AI extraction successful: {vision_result['text_length']} chars, "
+                        f"cost: ${vision_result['metadata'].get('cost_usd', 0):.4f}"
+                    )
+                    # Normalize vision_result structure to match text extraction format
+                    extraction_result = {
+                        "text": vision_result["text"],
+                        "text_preview": vision_result["text"][:TEXT_PREVIEW_LENGTH],
+                        "text_length": vision_result["text_length"],
+                        "method": vision_result["method"],
+                        "quality_score": vision_result["metadata"].get("confidence", 0.8),
+                        "extracted_at": vision_result.get("extracted_at") or datetime.utcnow().isoformat(),
+                        "metadata": vision_result.get("metadata", {})
+                    }
+
+                    # Track Vision AI cost
+                    try:
+                        cost_tracker = get_cost_tracking_service()
+                        cost_tracker.track_cost(
+                            db=db_session,
+                            service_type="vision_ai",
+                            model_name=vision_result["metadata"].get("model", "claude-vision"),
+                            cost_usd=vision_result["metadata"].get("cost_usd", 0),
+                            document_id=document_id,
+                            case_id=case_id,
+                            input_tokens=vision_result["metadata"].get("input_tokens"),
+                            output_tokens=vision_result["metadata"].get("output_tokens"),
+                            duration_ms=vision_result["metadata"].get("duration_ms"),
+                            success=True,
+                            extra_data={"pages_processed": vision_result["metadata"].get("pages_processed")},
+                            commit=False
+                        )
+                    except Exception as track_error:
+                        logger.error(f"Failed to track Vision AI cost: {str(track_error)}")
+                else:
+                    # Vision AI failed - mark as poor quality
+                    raise Exception(vision_result.get("error", "Vision AI extraction failed"))
+
+            except Exception as vision_error:
+                logger.warning(f"Vision AI fallback failed: {str(vision_error)}")
+
+                # Mark document as poor quality; only the preview is stored,
+                # in the same shape as a completed analysis
+                merge_document_metadata(db_session, document_id, {
+                    "extraction": {
+                        "text": extraction_result["text_preview"],
+                        "text_length": extraction_result["text_length"],
+                        "quality_score": extraction_result["quality_score"],
+                        "extracted_at": extraction_result["extracted_at"],
+                        "extraction_method": extraction_result["method"],
+                        "metadata": extraction_result.get("metadata", {})
+                    },
+                    "vision_fallback_attempted": True,
+                    "vision_fallback_error": str(vision_error),
+                    "processing": {
+                        "started_at": started_iso,
+                        "completed_at": datetime.utcnow().isoformat(),
+                        "error": "Text quality too low and Vision AI fallback failed"
+                    }
+                }, new_status="poor_quality")
+
+                pending_events.append(DocumentAnalysisFailedEvent.build(
+                    document_id, case_id,
+                    error_type="quality_too_low",
+                    error_message=f"Quality score {extraction_result['quality_score']} below threshold, Vision AI failed"
+                ))
+                Event.bulk_append(db_session, pending_events, PIPELINE_EVENT_METADATA)
+                db_session.commit()
+                return
+
+        # The file bytes are not needed for the AI round trip
+        file_buffer.close()
+
+        # 4. AI Analysis
+        analysis_started_ns = time.monotonic_ns()
+        # Hand the full text over and drop it from the result; only the
+        # preview is kept for storage
+        analysis_result = await ai_service.process_document(
+            extraction_result.pop("text"),
+            document.file_type
+        )
+        completed_ns = time.monotonic_ns()
+        completed_iso = datetime.utcnow().isoformat()
+        analysis_duration_ms = (completed_ns - analysis_started_ns) // 1_000_000
+
+        # Track AI costs
+        try:
+            cost_tracker = get_cost_tracking_service()
+
+            # Track Claude analysis cost
+            if "analysis" in analysis_result and "cost_usd" in analysis_result["analysis"]:
+                cost_tracker.track_cost(
+                    db=db_session,
+                    service_type="text_analysis",
+                    model_name=analysis_result["analysis"].get("model", "claude"),
+                    cost_usd=analysis_result["analysis"]["cost_usd"],
+                    document_id=document_id,
+                    case_id=case_id,
+                    input_tokens=analysis_result["analysis"].get("tokens_used"),
+                    output_tokens=None,
+                    duration_ms=analysis_duration_ms,
+                    success=True,
+                    commit=False
+                )
+
+            # Track GPT-4 entity extraction cost
+            if "entities" in analysis_result and "cost_usd" in analysis_result["entities"]:
+                cost_tracker.track_cost(
+                    db=db_session,
+                    service_type="entity_extraction",
+                    model_name=analysis_result["entities"].get("model", "gpt-4"),
+                    cost_usd=analysis_result["entities"]["cost_usd"],
+                    document_id=document_id,
+                    case_id=case_id,
+                    input_tokens=analysis_result["entities"].get("tokens_used"),
+                    output_tokens=None,
+                    success=True,
+                    commit=False
+                )
+        except Exception as track_error:
+            logger.error(f"Failed to track AI costs: {str(track_error)}")
+
+        # 5. Store results
+        merge_document_metadata(db_session, document_id, {
+            "extraction": {
+                "text": extraction_result["text_preview"],
+                "text_length": extraction_result["text_length"],
+                "quality_score": extraction_result["quality_score"],
+                "extracted_at": extraction_result["extracted_at"],
+                "extraction_method": extraction_result["method"],
+                "metadata": extraction_result.get("metadata", {})
+            },
+            "analysis": analysis_result["analysis"],
+            "entities": analysis_result["entities"],
+            "processing": {
+                "started_at": started_iso,
+                "completed_at": completed_iso,
+                "duration_ms": (completed_ns - started_ns) // 1_000_000,
+                "total_cost_usd": analysis_result["total_cost"]
+            }
+        }, new_status="analysis_complete")
+
+        # 6. Emit the run's events
+        pending_events.append(DocumentAnalyzedEvent.build(
+            document_id, case_id,
+            classification=analysis_result["analysis"]["classification"],
+            confidence=analysis_result["analysis"]["confidence"],
+            total_cost=analysis_result["total_cost"],
+            model_versions=analysis_result["model_versions"]
+        ))
+        Event.bulk_append(db_session, pending_events, PIPELINE_EVENT_METADATA)
+        db_session.commit()
+
+        logger.info(f"Document {document_id} analysis complete: {analysis_result['analysis']['classification']}")
+
+    except Exception as e:
+        logger.error(f"Document processing failed for {document_id}: {str(e)}")
+
+        # Update document status
+        try:
+            # Events and cost records of the steps that did complete go out
+            # with the failure record; only a database error discards them
+            if isinstance(e, SQLAlchemyError):
+                db_session.rollback()
+                pending_events.clear()
+
+            if merge_document_metadata(db_session, document_id, {
+                "processing": {
+                    "error": str(e),
+                    "error_type": type(e).__name__,
+                    "failed_at": datetime.utcnow().isoformat()
+                }
+            }, new_status="extraction_failed"):
+                pending_events.append(DocumentAnalysisFailedEvent.build(
+                    document_id, case_id,
+                    error_type=type(e).__name__,
+                    error_message=str(e)
+                ))
+                Event.bulk_append(db_session, pending_events, PIPELINE_EVENT_METADATA)
+                db_session.commit()
+        except Exception as db_error:
+            logger.error(f"Failed to update error status: {str(db_error)}")
+
+    finally:
+        db_session.close()
+
+        # Clean up temp file
+        if tmp_path and os.path.exists(tmp_path):
+            try:
+                os.unlink(tmp_path)
+            except Exception as cleanup_error:
+                logger.warning(f"Failed to delete temp file {tmp_path}: {str(cleanup_error)}")
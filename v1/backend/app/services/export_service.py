@@ -1,8 +1,16 @@
 """Export Service for generating DOCX and Markdown files from analysis data"""
 from datetime import datetime
 from io import BytesIO
+from typing import BinaryIO
 import logging
 
+try:
+    from docx import Document
+    from docx.shared import Inches, Pt
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+except ImportError:
+    Document = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -28,9 +36,26 @@ class ExportService:
         Returns:
             DOCX file as bytes
         """
-        from docx import Document
-        from docx.shared import Inches, Pt
-        from docx.enum.text import WD_ALIGN_PARAGRAPH
+        buffer = BytesIO()
+        self.write_docx(buffer, filename, analysis, entities, extraction)
+        return buffer.getvalue()
+
+    def write_docx(
+        self,
+        sink: BinaryIO,
+        filename: str,
+        analysis: dict,
+        entities: dict,
+        extraction: dict
+    ) -> None:
+        """
+        Write a DOCX file from analysis data into a binary file-like sink
+
+        Same arguments as generate_docx; the document is saved straight into
+        sink instead of being copied out as bytes.
+        """
+        if not Document:
+            raise ImportError("python-docx is required for DOCX export. Install with: pip install python-docx")
 
         doc = Document()
 
@@ -122,12 +147,7 @@ class ExportService:
                 p.add_run("Text Length: ").bold = True
                 p.add_run(f"{extraction['text_length']} characters\n")
 
-        # Save to bytes
-        buffer = BytesIO()
-        doc.save(buffer)
-        buffer.seek(0)
-
-        return buffer.getvalue()
+        doc.save(sink)
 
     def generate_markdown(
         self,
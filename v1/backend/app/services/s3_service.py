@@ -1,16 +1,34 @@
 """S3/MinIO service for document storage"""
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 from typing import BinaryIO, Optional
 import logging
-from app.config import get_settings
+from app.config import settings
 
 logger = logging.getLogger(__name__)
-settings = get_settings()
+
+MB = 1024 * 1024
+
+# Multipart transfer settings: files above the threshold are split into
+# parts and PUT (or ranged-GET) concurrently instead of as a single
+# serialized request
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=16 * MB,
+    max_concurrency=8,
+    use_threads=True
+)
 
 
 class S3Service:
-    """Service for interacting with S3/MinIO storage"""
+    """
+    Service for interacting with S3/MinIO storage
+
+    Methods are blocking (boto3). Call the network-bound ones (upload,
+    download, delete, head) from async code via run_in_threadpool.
+    Presigned URL generation is local signing and safe to call directly.
+    """
 
     def __init__(self):
         self.client = boto3.client(
@@ -68,7 +86,8 @@ class S3Service:
                 file_obj,
                 self.bucket_name,
                 s3_key,
-                ExtraArgs=extra_args
+                ExtraArgs=extra_args,
+                Config=TRANSFER_CONFIG
             )
             logger.info(f"Successfully uploaded {s3_key} to {self.bucket_name}")
             return True
@@ -80,6 +99,9 @@ class S3Service:
         """
         Download a file from S3 to local disk
 
+        Objects above the multipart threshold are fetched as concurrent
+        byte-range GETs written into place, not as one serial stream.
+
         Args:
             s3_key: S3 object key to download
             local_path: Local file path to save to
@@ -88,13 +110,35 @@ class S3Service:
             True if successful, False otherwise
         """
         try:
-            self.client.download_file(self.bucket_name, s3_key, local_path)
+            self.client.download_file(self.bucket_name, s3_key, local_path, Config=TRANSFER_CONFIG)
             logger.info(f"Successfully downloaded {s3_key} to {local_path}")
             return True
         except ClientError as e:
             logger.error(f"Error downloading file from S3: {e}")
             return False
 
+    def download_fileobj(self, s3_key: str, file_obj: BinaryIO) -> bool:
+        """
+        Download a file from S3 into a writable file-like object
+
+        Same ranged concurrent transfer as download_file; pass a seekable
+        object (e.g. io.BytesIO) so parts are written in place.
+
+        Args:
+            s3_key: S3 object key to download
+            file_obj: Binary file-like object to write into
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.client.download_fileobj(self.bucket_name, s3_key, file_obj, Config=TRANSFER_CONFIG)
+            logger.info(f"Successfully downloaded {s3_key} into memory")
+            return True
+        except ClientError as e:
+            logger.error(f"Error downloading file from S3: {e}")
+            return False
+
     def delete_file(self, s3_key: str) -> bool:
         """
         Delete a file from S3
@@ -125,22 +169,76 @@ class S3Service:
             Presigned URL or None if error
         """
         try:
-            url = self.client.generate_presigned_url(
+            return self._external_url(self.client.generate_presigned_url(
                 'get_object',
                 Params={'Bucket': self.bucket_name, 'Key': s3_key},
                 ExpiresIn=expiration
-            )
+            ))
+        except ClientError as e:
+            logger.error(f"Error generating presigned URL: {e}")
+            return None
 
-            # Replace internal endpoint with external endpoint for browser access
-            if settings.s3_external_endpoint:
-                url = url.replace(settings.s3_endpoint, settings.s3_external_endpoint)
-                logger.debug(f"Replaced internal endpoint with external: {url}")
+    def get_upload_post(
+        self,
+        s3_key: str,
+        content_type: str,
+        max_size: int,
+        expiration: int = 900
+    ) -> Optional[dict]:
+        """
+        Generate a presigned POST for a direct browser-to-S3 upload
+
+        S3 itself enforces the size range and content type, so an oversized
+        or mistyped body is rejected before it is stored. The client sends a
+        multipart/form-data POST with the returned fields plus `file` last.
+        The bucket needs a CORS rule allowing POST from the frontend origin.
+
+        Args:
+            s3_key: S3 object key to create
+            content_type: MIME type the upload must declare
+            max_size: Maximum accepted size in bytes
+            expiration: Expiration time in seconds (default 15 minutes)
 
-            return url
+        Returns:
+            {"url": ..., "fields": {...}} or None if error
+        """
+        try:
+            post = self.client.generate_presigned_post(
+                self.bucket_name,
+                s3_key,
+                Fields={'Content-Type': content_type},
+                Conditions=[
+                    {'Content-Type': content_type},
+                    ['content-length-range', 1, max_size]
+                ],
+                ExpiresIn=expiration
+            )
+            post['url'] = self._external_url(post['url'])
+            return post
         except ClientError as e:
-            logger.error(f"Error generating presigned URL: {e}")
+            logger.error(f"Error generating presigned POST: {e}")
             return None
 
+    def get_file_info(self, s3_key: str) -> Optional[dict]:
+        """
+        Get object size and type without downloading it
+
+        Returns:
+            head_object response (ContentLength, ContentType, ETag, ...) or
+            None if the object does not exist
+        """
+        try:
+            return self.client.head_object(Bucket=self.bucket_name, Key=s3_key)
+        except ClientError:
+            return None
+
+    def _external_url(self, url: str) -> str:
+        """Replace internal endpoint with external endpoint for browser access"""
+        if settings.s3_external_endpoint:
+            url = url.replace(settings.s3_endpoint, settings.s3_external_endpoint)
+            logger.debug(f"Replaced internal endpoint with external: {url}")
+        return url
+
     def file_exists(self, s3_key: str) -> bool:
         """Check if a file exists in S3"""
         try:
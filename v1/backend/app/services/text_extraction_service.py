@@ -6,11 +6,12 @@ Supports extraction from:
 - Scanned images using Tesseract OCR
 """
 import re
+from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 import logging
 
-from app.config import get_settings
+from app.config import settings
 
 try:
     import pdfplumber
@@ -32,6 +33,12 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Characters of extracted text kept in document_metadata
+TEXT_PREVIEW_LENGTH = 10000
+
+# Runs of 4+ identical characters (typical OCR noise)
+_REPEATED_CHARS_RE = re.compile(r'(.)\1{3,}')
+
 
 class TextExtractionService:
     """Service for extracting text from various document formats"""
@@ -47,12 +54,12 @@ class TextExtractionService:
         if tesseract_path and pytesseract:
             pytesseract.pytesseract.tesseract_cmd = tesseract_path
 
-    def extract_from_pdf(self, file_path: str) -> dict:
+    def extract_from_pdf(self, file_path: Union[str, BinaryIO]) -> dict:
         """
         Extract text from PDF file using pdfplumber
 
         Args:
-            file_path: Path to PDF file
+            file_path: Path to PDF file, or a binary file object
 
         Returns:
             dict with text, page_count, method, and metadata
@@ -89,12 +96,12 @@ class TextExtractionService:
             logger.error(f"PDF extraction failed for {file_path}: {str(e)}")
             raise ValueError(f"Failed to extract text from PDF: {str(e)}")
 
-    def extract_from_docx(self, file_path: str) -> dict:
+    def extract_from_docx(self, file_path: Union[str, BinaryIO]) -> dict:
         """
         Extract text from Word document using python-docx
 
         Args:
-            file_path: Path to DOCX file
+            file_path: Path to DOCX file, or a binary file object
 
         Returns:
             dict with text, paragraph_count, method, and metadata
@@ -136,12 +143,12 @@ class TextExtractionService:
             logger.error(f"DOCX extraction failed for {file_path}: {str(e)}")
             raise ValueError(f"Failed to extract text from DOCX: {str(e)}")
 
-    def extract_from_image(self, file_path: str) -> dict:
+    def extract_from_image(self, file_path: Union[str, BinaryIO]) -> dict:
         """
         Extract text from image using Tesseract OCR
 
         Args:
-            file_path: Path to image file (jpg, jpeg, png)
+            file_path: Path to image file (jpg, jpeg, png), or a binary file object
 
         Returns:
             dict with text, method, and metadata
@@ -210,7 +217,7 @@ class TextExtractionService:
         avg_word_length = text_length / word_count if word_count > 0 else 0
 
         # Check for repeated characters (OCR errors often produce these)
-        repeated_pattern = len(re.findall(r'(.)\1{3,}', text))
+        repeated_pattern = len(_REPEATED_CHARS_RE.findall(text))
         repeated_ratio = repeated_pattern / len(text) if text else 0
 
         # Calculate quality score
@@ -251,15 +258,36 @@ class TextExtractionService:
         if not file_path_obj.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
+        return self._extract(file_path, file_type, file_path_obj.suffix.lower(), str(file_path))
+
+    def extract_text_from_stream(self, file_obj: BinaryIO, file_type: str, filename: str = "") -> dict:
+        """
+        Extract text from an in-memory or otherwise seekable file object
+
+        pdfplumber, python-docx and PIL all read file-like objects, so the
+        file does not have to be written to disk first.
+
+        Args:
+            file_obj: Seekable binary file-like object positioned at the start
+            file_type: MIME type or file extension
+            filename: Original filename, used for its extension and in logs
+
+        Returns:
+            dict with extraction results including quality score
+        """
+        return self._extract(file_obj, file_type, Path(filename).suffix.lower(), filename or "<stream>")
+
+    def _extract(self, source: Union[str, BinaryIO], file_type: str, suffix: str, label: str) -> dict:
+        """Route to the extractor for file_type/suffix and add quality info"""
         # Determine extraction method
-        if 'pdf' in file_type.lower() or file_path_obj.suffix.lower() == '.pdf':
-            result = self.extract_from_pdf(file_path)
+        if 'pdf' in file_type.lower() or suffix == '.pdf':
+            result = self.extract_from_pdf(source)
 
-        elif 'word' in file_type.lower() or 'docx' in file_type.lower() or file_path_obj.suffix.lower() in ['.docx', '.doc']:
-            result = self.extract_from_docx(file_path)
+        elif 'word' in file_type.lower() or 'docx' in file_type.lower() or suffix in ['.docx', '.doc']:
+            result = self.extract_from_docx(source)
 
-        elif 'image' in file_type.lower() or file_path_obj.suffix.lower() in ['.jpg', '.jpeg', '.png', '.tiff', '.bmp']:
-            result = self.extract_from_image(file_path)
+        elif 'image' in file_type.lower() or suffix in ['.jpg', '.jpeg', '.png', '.tiff', '.bmp']:
+            result = self.extract_from_image(source)
 
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
@@ -267,20 +295,20 @@ class TextExtractionService:
         # Assess quality
         quality_score = self.assess_quality(result["text"])
         result["quality_score"] = quality_score
+        # Bounded copy for storage; callers drop "text" once it is consumed
+        result["text_preview"] = result["text"][:TEXT_PREVIEW_LENGTH]
 
         # Check if Vision AI fallback is needed
-        settings = get_settings()
         result["needs_vision_fallback"] = (
             settings.vision_ai_enabled and
             quality_score < settings.vision_ai_quality_threshold
         )
 
         # Add extraction timestamp
-        from datetime import datetime
         result["extracted_at"] = datetime.utcnow().isoformat()
 
         logger.info(
-            f"Text extraction complete: {file_path} | "
+            f"Text extraction complete: {label} | "
             f"Method: {result['method']} | "
             f"Length: {result['text_length']} | "
             f"Quality: {quality_score} | "
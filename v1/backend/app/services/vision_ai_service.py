@@ -11,6 +11,7 @@ Supports:
 """
 import base64
 import logging
+import re
 from pathlib import Path
 from typing import List, Dict, Optional
 from datetime import datetime
@@ -26,10 +27,13 @@ try:
 except ImportError:
     fitz = None
 
-from app.config import get_settings
+from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+# JSON object wrapped in a markdown code fence
+_JSON_BLOCK_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.DOTALL)
+
 
 class VisionAIService:
     """Service for Vision AI-powered document analysis"""
@@ -46,7 +50,6 @@ class VisionAIService:
 
     def __init__(self):
         """Initialize Vision AI service"""
-        settings = get_settings()
 
         if not Anthropic:
             raise ImportError("anthropic library required. Install: pip install anthropic")
@@ -237,8 +240,7 @@ Remember: Return ONLY the JSON object, nothing else."""
                 extracted_data = json.loads(response_text)
             except json.JSONDecodeError:
                 # Try to extract JSON from markdown code blocks
-                import re
-                json_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
+                json_match = _JSON_BLOCK_RE.search(response_text)
                 if json_match:
                     try:
                         extracted_data = json.loads(json_match.group(1))
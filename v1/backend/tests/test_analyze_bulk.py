@@ -0,0 +1,59 @@
+"""analyze_bulk marks and audits the whole batch on the AsyncSession"""
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api import documents
+from app.api.schemas import BulkAnalyzeRequest
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def all(self):
+        return self._rows
+
+
+class FakeAsyncSession:
+    """Answers the document SELECT with canned rows, records every statement"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+        self.committed = False
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.rows)
+
+    async def commit(self):
+        self.committed = True
+
+
+@pytest.mark.asyncio
+async def test_bulk_queues_only_unanalyzed(monkeypatch):
+    queued = []
+
+    async def enqueue(document_ids, case_id):
+        queued.extend(document_ids)
+
+    monkeypatch.setattr(documents, "enqueue_bulk_analysis", enqueue)
+    fresh, analyzed = uuid4(), uuid4()
+    db = FakeAsyncSession([
+        SimpleNamespace(document_id=fresh, analyzed=False),
+        SimpleNamespace(document_id=analyzed, analyzed=True),
+    ])
+
+    result = await documents.analyze_bulk(uuid4(), BulkAnalyzeRequest(document_ids=[fresh, analyzed]), db)
+
+    assert result["queued"] == 1
+    assert result["already_analyzed"] == 1
+    assert queued == [fresh]
+    assert db.committed
+    select_sql, update_sql, events_sql = db.statements
+    assert update_sql.startswith("UPDATE documents SET status=")
+    # One multi-row INSERT through Event.bulk_append
+    assert events_sql.startswith("INSERT INTO events")
@@ -0,0 +1,139 @@
+"""Bulk annotation route and the ordering/ETag of the annotation list"""
+from datetime import datetime
+from uuid import UUID, uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+
+from app.db.database import get_async_db
+from app.main import app
+
+CREATED_AT = datetime(2026, 10, 15, 12, 0, 0)
+RECT = {"x": 1.0, "y": 2.0, "width": 3.0, "height": 4.0}
+
+
+class FakeResult:
+    def __init__(self, value):
+        self._value = value
+
+    def one(self):
+        return self._value
+
+    def first(self):
+        return self._value[0] if self._value else None
+
+    def all(self):
+        return self._value
+
+    def scalars(self):
+        return self
+
+    def mappings(self):
+        return self
+
+
+class FakeAsyncSession:
+    """Answers statements in order from a list and records their SQL"""
+
+    def __init__(self, results, scalar=None):
+        self.results = list(results)
+        self.scalar_value = scalar
+        self.statements = []
+        self.committed = False
+
+    def _record(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+
+    async def execute(self, statement):
+        self._record(statement)
+        return FakeResult(self.results.pop(0))
+
+    async def scalar(self, statement):
+        self._record(statement)
+        return self.scalar_value
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+def client_for(db: FakeAsyncSession) -> TestClient:
+    async def override():
+        yield db
+
+    app.dependency_overrides[get_async_db] = override
+    return TestClient(app)
+
+
+def annotations_url(case_id, document_id, suffix=""):
+    return f"/api/v1/cases/{case_id}/documents/{document_id}/annotations{suffix}"
+
+
+def teardown_function():
+    app.dependency_overrides.clear()
+
+
+def test_bulk_create_keeps_request_order():
+    document_id = uuid4()
+    db = FakeAsyncSession([[CREATED_AT]], scalar=document_id)
+    body = [
+        {"page": 1, "rects": [RECT], "text": "first"},
+        {"page": 2, "rects": [RECT], "color": "green", "text": "second"},
+        {"page": 1, "rects": [RECT, RECT], "text": "third"},
+    ]
+
+    response = client_for(db).post(annotations_url(uuid4(), document_id, "/bulk"), json=body)
+
+    assert response.status_code == 201
+    annotations = response.json()
+    assert [a["text"] for a in annotations] == ["first", "second", "third"]
+    assert annotations[1]["color"] == "green"
+    # UUIDv7: ids follow the request order
+    ids = [UUID(a["id"]) for a in annotations]
+    assert ids == sorted(ids)
+    assert db.committed
+    # Document check, then one statement for all rows and their events
+    assert len(db.statements) == 2
+    assert db.statements[1].count("INSERT INTO document_annotations") == 1
+    assert db.statements[1].count("INSERT INTO events") == 1
+
+
+def test_bulk_create_rejects_empty_batch():
+    db = FakeAsyncSession([])
+
+    response = client_for(db).post(annotations_url(uuid4(), uuid4(), "/bulk"), json=[])
+
+    assert response.status_code == 422
+    assert not db.statements
+
+
+def test_list_orders_by_id_within_a_timestamp():
+    newest_id = "0192f0a0-0000-7000-8000-000000000002"
+    rows = [
+        {"id": "0192f0a0-0000-7000-8000-000000000001", "page": 1, "rects": [RECT],
+         "color": "yellow", "text": None, "created_at": CREATED_AT},
+        {"id": newest_id, "page": 1, "rects": [RECT],
+         "color": "yellow", "text": None, "created_at": CREATED_AT},
+    ]
+    db = FakeAsyncSession([(2, CREATED_AT, newest_id), rows])
+
+    response = client_for(db).get(annotations_url(uuid4(), uuid4()))
+
+    assert response.status_code == 200
+    assert [a["id"] for a in response.json()] == [row["id"] for row in rows]
+    assert response.headers["etag"] == f'"2:{CREATED_AT.isoformat()}:{newest_id}"'
+    assert "ORDER BY document_annotations.created_at, document_annotations.annotation_id" in db.statements[1]
+
+
+def test_list_not_modified_for_matching_etag():
+    newest_id = "0192f0a0-0000-7000-8000-000000000002"
+    etag = f'"2:{CREATED_AT.isoformat()}:{newest_id}"'
+    db = FakeAsyncSession([(2, CREATED_AT, newest_id)])
+
+    response = client_for(db).get(annotations_url(uuid4(), uuid4()), headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    # The rows themselves are never selected
+    assert len(db.statements) == 1
@@ -0,0 +1,78 @@
+"""GET /admin/costs/cases/{case_id} reads the case_ai_cost_summary view"""
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
+from fastapi.testclient import TestClient
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Query
+
+from app.db.database import get_db
+from app.main import app
+
+
+class FakeQuery:
+    """Builds the real ORM query, returns canned rows instead of running it"""
+
+    def __init__(self, db, query):
+        self.db = db
+        self.query = query
+
+    def __getattr__(self, name):
+        method = getattr(self.query, name)
+        return lambda *args, **kwargs: FakeQuery(self.db, method(*args, **kwargs))
+
+    def all(self):
+        self.db.statements.append(str(self.query.statement.compile(dialect=postgresql.dialect())))
+        return self.db.rows
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def query(self, *entities):
+        return FakeQuery(self, Query(entities))
+
+
+def get_case_costs(db: FakeSession, case_id):
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        return TestClient(app).get(f"/api/v1/admin/costs/cases/{case_id}")
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_case_costs_from_summary_view():
+    case_id = uuid4()
+    last_call = datetime(2026, 10, 15, 9, 30)
+    db = FakeSession([
+        SimpleNamespace(service_type="claude", total_cost=Decimal("1.25"), calls=3, last_call=last_call),
+        SimpleNamespace(service_type="textract", total_cost=Decimal("0.5"), calls=2, last_call=last_call),
+    ])
+
+    response = get_case_costs(db, case_id)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["case_id"] == str(case_id)
+    assert body["total_cost_usd"] == 1.75
+    assert [c["service_type"] for c in body["costs_by_service"]] == ["claude", "textract"]
+    assert body["costs_by_service"][0]["request_count"] == 3
+
+    (sql,) = db.statements
+    assert "FROM case_ai_cost_summary" in sql
+    assert "ai_cost_tracking" not in sql
+    assert "WHERE case_ai_cost_summary.case_id = " in sql
+
+
+def test_case_costs_without_spend():
+    db = FakeSession([])
+
+    response = get_case_costs(db, uuid4())
+
+    assert response.status_code == 200
+    assert response.json()["total_cost_usd"] == 0
+    assert response.json()["costs_by_service"] == []
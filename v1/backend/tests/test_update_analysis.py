@@ -0,0 +1,55 @@
+"""update_analysis builds one UPDATE for every combination of sections"""
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.documents import update_analysis
+from app.api.schemas import AnalysisUpdateRequest
+
+
+class FakeResult:
+    def __init__(self, row):
+        self._row = row
+
+    def one_or_none(self):
+        return self._row
+
+
+class FakeAsyncSession:
+    """Records and compiles statements instead of sending them"""
+
+    def __init__(self, row):
+        self.row = row
+        self.statements = []
+        self.committed = False
+
+    async def execute(self, statement):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.row)
+
+    async def commit(self):
+        self.committed = True
+
+    async def rollback(self):
+        pass
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fields", [
+    {"summary": "s"},
+    {"entities": {"dates": ["2024"]}},
+    # The frontend sends both when a summary and an entity are edited together
+    {"summary": "s", "entities": {"dates": ["2024"]}},
+])
+async def test_update_analysis_sections(fields):
+    row = ("analysis_complete", {"text": "t"}, {"summary": "s"}, {"dates": ["2024"]}, None)
+    db = FakeAsyncSession(row)
+
+    response = await update_analysis(uuid4(), uuid4(), AnalysisUpdateRequest(**fields), db)
+
+    assert db.committed
+    (sql,) = db.statements
+    assert sql.count("jsonb_set(") == len(fields)
+    assert response.status == "analysis_complete"
+    assert response.analysis == {"summary": "s"}
@@ -32,7 +32,7 @@ export interface Document {
   s3_key: string;
   s3_bucket: string;
   status: 'uploaded' | 'processing' | 'failed' | 'analysis_complete' | 'extraction_failed' | 'poor_quality';
-  document_metadata: Record<string, any> | null;
+  document_metadata?: Record<string, any> | null;  // Not included in list responses
   created_at: string;
   updated_at: string;
 }